@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Bulk growth analytics over scraped profile snapshots
+All per-snapshot math runs as vectorized NumPy operations over columnar arrays
+holding every profile at once; Python only loops to build the JSON response
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+SECONDS_PER_DAY = 86400.0
+# A step is only scored against at least this many other steps of the same profile
+MIN_BASELINE_STEPS = 2
+# Floor for the baseline spread in daily growth rate (0.01%/day). Besides this, the spread
+# is never taken below one follower over the scored step, the resolution of the counts, so
+# +1 follower on a flat history is not scored as a huge deviation.
+MIN_RATE_STD = 1e-4
+
+def to_columns(profiles: Iterable[dict]):
+    """Flatten [{"key", "snapshots": [{"timestamp", "followers", "posts"}]}] into columns
+    
+    Returns (keys, lengths, timestamps, followers, posts); missing counts become NaN.
+    """
+    keys: List[str] = []
+    lengths: List[int] = []
+    timestamps: List[float] = []
+    followers: List[float] = []
+    posts: List[float] = []
+    nan = float("nan")
+    for profile in profiles:
+        snapshots = profile["snapshots"]
+        keys.append(profile["key"])
+        lengths.append(len(snapshots))
+        for snapshot in snapshots:
+            timestamps.append(snapshot["timestamp"])
+            value = snapshot.get("followers")
+            followers.append(nan if value is None else value)
+            value = snapshot.get("posts")
+            posts.append(nan if value is None else value)
+    return (
+        keys,
+        np.asarray(lengths, dtype=np.int64),
+        np.asarray(timestamps, dtype=np.float64),
+        np.asarray(followers, dtype=np.float64),
+        np.asarray(posts, dtype=np.float64),
+    )
+
+def _first_last(values: np.ndarray, profile_index: np.ndarray, profile_count: int):
+    """Positions of the first and last non-NaN value per profile (-1 if none)"""
+    positions = np.arange(len(values))
+    valid = ~np.isnan(values)
+    first = np.full(profile_count, len(values), dtype=np.int64)
+    last = np.full(profile_count, -1, dtype=np.int64)
+    np.minimum.at(first, profile_index[valid], positions[valid])
+    np.maximum.at(last, profile_index[valid], positions[valid])
+    first[first == len(values)] = -1
+    return first, last
+
+def _moving_average(values: np.ndarray, position: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over the last `window` snapshots of the same profile, ignoring NaNs"""
+    valid = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    end = np.arange(1, len(values) + 1)
+    start = end - np.minimum(position + 1, window)
+    count = counts[end] - counts[start]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, (sums[end] - sums[start]) / count, np.nan)
+
+def compute_growth_analytics(keys: Sequence[str], lengths: np.ndarray, timestamps: np.ndarray,
+                             followers: np.ndarray, posts: np.ndarray, window: int = 7,
+                             z_threshold: float = 3.0, include_series: bool = False) -> List[dict]:
+    """Growth rates, moving averages and anomaly flags for many profiles at once
+    
+    Snapshots are given as flat columns, `lengths[i]` rows per profile in order.
+    A step between consecutive snapshots is flagged as anomalous when its daily
+    follower growth rate is more than z_threshold standard deviations from the
+    mean rate of the profile's other steps (profiles need at least three steps
+    to be scored). Snapshots may be in any time order; NaN counts are skipped.
+    """
+    profile_count = len(keys)
+    profile_index = np.repeat(np.arange(profile_count), lengths)
+    
+    # Order snapshots by profile, then time
+    order = np.lexsort((timestamps, profile_index))
+    profile_index, timestamps = profile_index[order], timestamps[order]
+    followers, posts = followers[order], posts[order]
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+    position = np.arange(len(timestamps)) - starts[profile_index]
+    
+    moving_average = _moving_average(followers, position, window)
+    
+    # Daily growth rate for each step between consecutive snapshots of one profile
+    same_profile = profile_index[1:] == profile_index[:-1]
+    elapsed_days = np.diff(timestamps) / SECONDS_PER_DAY
+    with np.errstate(invalid="ignore", divide="ignore"):
+        step_rate = np.diff(followers) / followers[:-1] / elapsed_days
+    step_valid = same_profile & (elapsed_days > 0) & np.isfinite(step_rate)
+    step_profile = profile_index[1:]
+    
+    # Score each step against the mean and std of the profile's *other* steps, so an
+    # outlier neither inflates the spread it is measured against nor caps its own z
+    rate = np.where(step_valid, step_rate, 0.0)
+    step_count = np.bincount(step_profile, weights=step_valid.astype(np.float64), minlength=profile_count)
+    rate_sum = np.bincount(step_profile, weights=rate, minlength=profile_count)
+    rate_sq_sum = np.bincount(step_profile, weights=rate * rate, minlength=profile_count)
+    others = step_count[step_profile] - 1
+    with np.errstate(invalid="ignore", divide="ignore"):
+        others_mean = (rate_sum[step_profile] - rate) / others
+        others_var = (rate_sq_sum[step_profile] - rate * rate) / others - others_mean ** 2
+        resolution = np.maximum(1.0 / np.abs(followers[:-1]) / elapsed_days, MIN_RATE_STD)
+        others_std = np.maximum(np.sqrt(np.maximum(others_var, 0.0)), resolution)
+        z_score = (step_rate - others_mean) / others_std
+    anomalous = step_valid & (others >= MIN_BASELINE_STEPS) & (np.abs(z_score) > z_threshold)
+    
+    # Whole-history growth per profile
+    first, last = _first_last(followers, profile_index, profile_count)
+    has_data = first >= 0
+    first_value = np.where(has_data, followers[np.maximum(first, 0)], np.nan)
+    last_value = np.where(has_data, followers[np.maximum(last, 0)], np.nan)
+    span_days = np.where(has_data, (timestamps[np.maximum(last, 0)] - timestamps[np.maximum(first, 0)]) / SECONDS_PER_DAY, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        growth = (last_value - first_value) / first_value
+        daily_growth = np.where(span_days > 0, np.power(last_value / first_value, 1.0 / span_days) - 1.0, np.nan)
+    post_first, post_last = _first_last(posts, profile_index, profile_count)
+    post_span = np.where(post_first >= 0, (timestamps[np.maximum(post_last, 0)] - timestamps[np.maximum(post_first, 0)]) / SECONDS_PER_DAY, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        posts_per_day = np.where(post_span > 0, (posts[np.maximum(post_last, 0)] - posts[np.maximum(post_first, 0)]) / post_span, np.nan)
+    ends = starts + lengths - 1
+    latest_average = np.where(lengths > 0, moving_average[np.maximum(ends, 0)] if len(moving_average) else np.nan, np.nan)
+    
+    # Group flagged steps by profile for the response
+    anomalies: Dict[int, List[dict]] = {}
+    for step in np.nonzero(anomalous)[0]:
+        anomalies.setdefault(int(step_profile[step]), []).append({
+            "timestamp": float(timestamps[step + 1]),
+            "followers": _number(followers[step + 1]),
+            "daily_growth_rate": _number(step_rate[step]),
+            "z_score": _number(z_score[step]),
+        })
+    
+    results = []
+    for i, key in enumerate(keys):
+        result = {
+            "key": key,
+            "snapshots": int(lengths[i]),
+            "latest_followers": _number(last_value[i]),
+            "follower_change": _number(last_value[i] - first_value[i]),
+            "follower_growth_pct": _number(growth[i] * 100),
+            "daily_growth_pct": _number(daily_growth[i] * 100),
+            "moving_average": _number(latest_average[i]),
+            "posts_per_day": _number(posts_per_day[i]),
+            "anomalies": anomalies.get(i, []),
+        }
+        if include_series:
+            rows = slice(starts[i], starts[i] + lengths[i])
+            result["series"] = {
+                "timestamps": timestamps[rows].tolist(),
+                "followers": [_number(v) for v in followers[rows]],
+                "moving_average": [_number(v) for v in moving_average[rows]],
+            }
+        results.append(result)
+    return results
+
+def _number(value) -> Optional[float]:
+    """JSON-safe float: NaN and infinities become None"""
+    value = float(value)
+    return value if np.isfinite(value) else None
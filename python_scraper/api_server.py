@@ -4,12 +4,21 @@ FastAPI server for social media scraping
 Provides REST API endpoints for Next.js frontend
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+import asyncio
+import os
+import time
 import uvicorn
 from scraper import SocialMediaScraper, SocialMediaData
+from jobs import JobManager, QueueFullError
+from subscriptions import ProfileUpdateHub, parse_keys, profile_url
+from profiling import StackSampler, profile_call
+from analytics import compute_growth_analytics, to_columns
 
 app = FastAPI(title="Social Media Scraper API", version="1.0.0")
 
@@ -22,16 +31,98 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize scraper
-scraper = SocialMediaScraper()
+# Initialize scraper (SCRAPER_* environment variables, see SocialMediaScraper.from_env)
+scraper = SocialMediaScraper.from_env()
+
+# Last known profile snapshots and /api/subscribe listeners
+SUBSCRIPTION_REFRESH_SECONDS = float(os.getenv("SCRAPER_SUBSCRIPTION_REFRESH_SECONDS", "300"))
+update_hub = ProfileUpdateHub(failure_ttl=SUBSCRIPTION_REFRESH_SECONDS or 300.0)
+MAX_SUBSCRIPTION_KEYS = 200
+# Scrapes one subscribe request may queue for profiles nobody has scraped yet
+MAX_SUBSCRIBE_SCRAPES = 10
+MAX_ANALYTICS_PROFILES = int(os.getenv("SCRAPER_ANALYTICS_MAX_PROFILES", "50000"))
+
+# Background scrape queue for /api/jobs
+job_manager = JobManager(
+    scraper.scrape_from_url,
+    workers=int(os.getenv("SCRAPER_JOB_WORKERS", "2")),
+    max_queue=int(os.getenv("SCRAPER_JOB_QUEUE_SIZE", "100")),
+    on_result=update_hub.publish,
+    callback_hosts=[h.strip() for h in os.getenv("SCRAPER_CALLBACK_HOSTS", "").split(",") if h.strip()],
+)
+background_tasks = []
+
+# Opt-in profiling: per request via ?profile=true or X-Scrape-Profile, honoured only when
+# SCRAPER_ALLOW_REQUEST_PROFILING=1, and a global stack sampler enabled with SCRAPER_SAMPLING_PROFILER=1
+PROFILE_DIR = os.getenv("SCRAPER_PROFILE_DIR", "profiles")
+ALLOW_REQUEST_PROFILING = os.getenv("SCRAPER_ALLOW_REQUEST_PROFILING", "0") == "1"
+stack_sampler = StackSampler.from_env()
+
+@app.on_event("startup")
+async def start_job_workers():
+    if stack_sampler:
+        stack_sampler.start()
+    await job_manager.start()
+    if SUBSCRIPTION_REFRESH_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(
+            update_hub.run_refresher(refresh_profile, SUBSCRIPTION_REFRESH_SECONDS)
+        ))
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    for task in background_tasks:
+        task.cancel()
+    await job_manager.stop()
+    if scraper.session_pool:
+        scraper.session_pool.save()
+    if stack_sampler:
+        stack_sampler.stop()
+
+# Default end-to-end budget in seconds for a scrape when the caller sets none (unset = unbounded)
+DEFAULT_TIMEOUT = float(os.getenv("SCRAPER_REQUEST_TIMEOUT", "0")) or None
+
+# Queue slots background refreshes leave free for user jobs
+REFRESH_QUEUE_RESERVE = job_manager.max_queue // 4
+
+def refresh_profile(url: str):
+    """Queue a background re-scrape of a subscribed profile unless one is already pending"""
+    if not job_manager.is_pending(url):
+        job_manager.submit(url, timeout=DEFAULT_TIMEOUT, reserve=REFRESH_QUEUE_RESERVE)
+
+def deadline_from_timeout(timeout: Optional[float]) -> Optional[float]:
+    """Turn a caller's budget in seconds into a time.monotonic() deadline"""
+    timeout = timeout or DEFAULT_TIMEOUT
+    return time.monotonic() + timeout if timeout else None
 
 class ScrapeRequest(BaseModel):
     url: str
+    timeout: Optional[float] = None  # seconds for the whole scrape, including fallbacks
+
+class JobRequest(BaseModel):
+    url: str
+    callback_url: Optional[str] = None
+    timeout: Optional[float] = None  # seconds, counted from when the job starts running
+
+class Snapshot(BaseModel):
+    timestamp: float  # unix seconds
+    followers: Optional[int] = None
+    posts: Optional[int] = None
+
+class ProfileHistory(BaseModel):
+    key: str  # e.g. "INSTAGRAM:username"
+    snapshots: List[Snapshot]
+
+class AnalyticsRequest(BaseModel):
+    profiles: List[ProfileHistory]
+    window: int = 7  # snapshots per moving average
+    z_threshold: float = 3.0
+    include_series: bool = False
 
 class ScrapeResponse(BaseModel):
     success: bool
     data: Optional[dict] = None
     error: Optional[str] = None
+    profile: Optional[dict] = None
 
 @app.get("/")
 async def root():
@@ -42,38 +133,35 @@ async def health_check():
     return {"status": "healthy", "service": "social-media-scraper"}
 
 @app.post("/api/scrape", response_model=ScrapeResponse)
-async def scrape_profile(request: ScrapeRequest):
+async def scrape_profile(request: ScrapeRequest,
+                         profile: bool = Query(False, description="Return a cProfile summary of this scrape"),
+                         x_scrape_profile: Optional[str] = Header(None)):
     """Scrape social media profile from URL"""
     try:
         if not request.url:
             raise HTTPException(status_code=400, detail="URL is required")
         
-        # Scrape the profile
-        result = scraper.scrape_from_url(request.url)
+        # Scrape the profile off the event loop, which also serves jobs and SSE streams
+        deadline = deadline_from_timeout(request.timeout)
+        profile_summary = None
+        if ALLOW_REQUEST_PROFILING and (profile or x_scrape_profile in ("1", "true", "yes")):
+            result, profile_summary = await run_in_threadpool(
+                profile_call, scraper.scrape_from_url, request.url, deadline, output_dir=PROFILE_DIR)
+        else:
+            result = await run_in_threadpool(scraper.scrape_from_url, request.url, deadline)
+        update_hub.publish(result)
         
         if result.error:
             return ScrapeResponse(
                 success=False,
-                error=result.error
+                error=result.error,
+                profile=profile_summary
             )
         
-        # Convert to dict for JSON response
-        data = {
-            "platform": result.platform,
-            "username": result.username,
-            "followers": result.followers,
-            "following": result.following,
-            "posts": result.posts,
-            "bio": result.bio,
-            "profile_url": result.profile_url,
-            "is_private": result.is_private,
-            "is_verified": result.is_verified,
-            "profile_picture": result.profile_picture
-        }
-        
         return ScrapeResponse(
             success=True,
-            data=data
+            data=result.to_dict(),
+            profile=profile_summary
         )
         
     except Exception as e:
@@ -83,46 +171,118 @@ async def scrape_profile(request: ScrapeRequest):
         )
 
 @app.get("/api/scrape/{platform}/{username}")
-async def scrape_by_platform(platform: str, username: str):
+async def scrape_by_platform(platform: str, username: str,
+                             timeout: Optional[float] = Query(None, description="Seconds for the whole scrape")):
     """Scrape specific platform profile"""
     try:
         platform = platform.upper()
+        deadline = deadline_from_timeout(timeout)
         
         if platform == "INSTAGRAM":
-            result = scraper.scrape_instagram(username)
+            scrape = scraper.scrape_instagram
         elif platform == "TWITTER":
-            result = scraper.scrape_twitter(username)
+            scrape = scraper.scrape_twitter
         elif platform == "YOUTUBE":
-            result = scraper.scrape_youtube(username)
+            scrape = scraper.scrape_youtube
         elif platform == "LINKEDIN":
-            result = scraper.scrape_linkedin(username)
+            scrape = scraper.scrape_linkedin
         else:
             raise HTTPException(status_code=400, detail="Unsupported platform")
+        result = await run_in_threadpool(scrape, username, deadline)
+        
+        update_hub.publish(result)
         
         if result.error:
             raise HTTPException(status_code=500, detail=result.error)
         
-        # Convert to dict for JSON response
-        data = {
-            "platform": result.platform,
-            "username": result.username,
-            "followers": result.followers,
-            "following": result.following,
-            "posts": result.posts,
-            "bio": result.bio,
-            "profile_url": result.profile_url,
-            "is_private": result.is_private,
-            "is_verified": result.is_verified,
-            "profile_picture": result.profile_picture
-        }
-        
-        return {"success": True, "data": data}
+        return {"success": True, "data": result.to_dict()}
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Scraping failed: {str(e)}")
 
+@app.post("/api/jobs", status_code=202)
+async def create_job(request: JobRequest):
+    """Queue a scrape and return its job ID immediately"""
+    if not request.url:
+        raise HTTPException(status_code=400, detail="URL is required")
+    try:
+        if request.callback_url:
+            await job_manager.check_callback(request.callback_url)
+        job = job_manager.submit(request.url, request.callback_url, request.timeout or DEFAULT_TIMEOUT)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"job_id": job.id, "status": job.status, "queue_depth": job_manager.depth}
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Poll a scrape job"""
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@app.get("/api/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """Stream a scrape job's completion as server-sent events"""
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        job_manager.events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@app.get("/api/subscribe")
+async def subscribe(keys: str = Query(..., description="Comma-separated platform:username keys")):
+    """Stream changed profile fields for the given keys as server-sent events"""
+    try:
+        parsed = parse_keys(keys)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if len(parsed) > MAX_SUBSCRIPTION_KEYS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SUBSCRIPTION_KEYS} keys per subscription")
+    subscriber = update_hub.subscribe(parsed)
+    # Profiles nobody has scraped yet would stay empty until the next refresh round
+    for key in update_hub.unknown_keys(parsed)[:MAX_SUBSCRIBE_SCRAPES]:
+        try:
+            refresh_profile(profile_url(key))
+        except QueueFullError:
+            break
+    return StreamingResponse(
+        update_hub.stream(subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@app.post("/api/analytics")
+async def profile_analytics(request: AnalyticsRequest):
+    """Growth rates, moving averages and anomaly flags for a batch of snapshot histories"""
+    if request.window < 1:
+        raise HTTPException(status_code=400, detail="window must be at least 1")
+    if len(request.profiles) > MAX_ANALYTICS_PROFILES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_ANALYTICS_PROFILES} profiles per request")
+    columns = to_columns(
+        {"key": profile.key, "snapshots": [vars(snapshot) for snapshot in profile.snapshots]}
+        for profile in request.profiles
+    )
+    results = await run_in_threadpool(
+        compute_growth_analytics, *columns,
+        window=request.window, z_threshold=request.z_threshold, include_series=request.include_series
+    )
+    return {"profiles": results}
+
+@app.get("/api/proxies")
+async def get_proxy_health():
+    """Health, latency and load of each configured proxy"""
+    if not scraper.proxy_pool:
+        return {"enabled": False, "proxies": []}
+    return {"enabled": True, "proxies": scraper.proxy_pool.snapshot()}
+
 @app.get("/api/platforms")
 async def get_supported_platforms():
     """Get list of supported platforms"""
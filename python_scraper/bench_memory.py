@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for page extraction
+Compares peak allocation per scrape when parsing the decoded page as str (the
+previous path: response.text, findall over the whole page, html.lower() copies)
+against parsing the raw response bytes directly
+"""
+
+import argparse
+import glob
+import os
+import time
+import tracemalloc
+
+from scraper import (
+    BIO_PATTERNS, FOLLOWER_PATTERNS, POST_PATTERNS,
+    INSTAGRAM_PRIVATE_TERMS, INSTAGRAM_VERIFIED_TERMS,
+    SocialMediaScraper,
+)
+
+FIXTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRIVATE_TERMS = ['private', 'this account is private', 'content is private']
+VERIFIED_TERMS = ['verified', '✓', 'checkmark', 'blue badge']
+
+def parse_decoded(body: bytes):
+    """The str path: decode the whole body, then scan and lowercase copies of it"""
+    html = body.decode('utf-8')
+    is_private = any(term in html.lower() for term in PRIVATE_TERMS)
+    is_verified = any(term in html.lower() for term in VERIFIED_TERMS)
+    results = []
+    for patterns in (FOLLOWER_PATTERNS[0], POST_PATTERNS[0], BIO_PATTERNS[0]):
+        for pattern in patterns:
+            matches = pattern.findall(html)
+            if matches:
+                results.append(matches[0])
+                break
+        else:
+            results.append(None)
+    return results, is_private, is_verified
+
+def parse_bytes(scraper: SocialMediaScraper, body: bytes):
+    """The bytes path used by the HTTP tier"""
+    return (
+        [scraper._extract_followers(body), scraper._extract_posts(body), scraper._extract_bio(body)],
+        scraper._contains_any(body, INSTAGRAM_PRIVATE_TERMS),
+        scraper._contains_any(body, INSTAGRAM_VERIFIED_TERMS),
+    )
+
+def measure(fn, body: bytes, repeat: int):
+    """Peak traced allocation (bytes) and mean wall time (ms) of fn(body)"""
+    fn(body)  # warm the regex cache outside the measurement
+    tracemalloc.start()
+    fn(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(body)
+    elapsed = (time.perf_counter() - started) / repeat
+    return peak, elapsed * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak allocation per scrape: decoded str vs raw bytes parsing")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per fixture")
+    args = parser.parse_args()
+
+    scraper = SocialMediaScraper(use_selenium=False, save_debug_html=False)
+    print(f"{'fixture':<48} {'size':>8} {'str peak':>10} {'bytes peak':>11} {'str ms':>8} {'bytes ms':>9}")
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "debug_*.html"))):
+        with open(path, 'rb') as f:
+            body = f.read()
+        str_peak, str_ms = measure(parse_decoded, body, args.repeat)
+        bytes_peak, bytes_ms = measure(lambda b: parse_bytes(scraper, b), body, args.repeat)
+        print(f"{os.path.basename(path):<48} {len(body) // 1024:>6}KB "
+              f"{str_peak // 1024:>8}KB {bytes_peak // 1024:>9}KB {str_ms:>8.1f} {bytes_ms:>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Resumable bulk scraper
+Streams profile URLs from CSV/JSONL/text, scrapes them concurrently under rate
+limits, writes results incrementally and checkpoints progress so an interrupted
+run resumes without re-fetching completed profiles
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Set
+from urllib.parse import urlparse
+
+from proxy_pool import ProxyPool
+from rate_limit import TokenBucket
+from scraper import SocialMediaData, SocialMediaScraper, platform_from_host
+from session_pool import SessionPool
+
+# Try to import pyarrow for Parquet output
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+def iter_urls(path: str, column: str = "url") -> Iterator[str]:
+    """Yield URLs one at a time from a .csv, .jsonl or plain text file"""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline='', encoding='utf-8') as f:
+        if extension == ".csv":
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            if column in header:
+                index = header.index(column)
+            else:
+                # No matching header: treat the first column of every row as a URL
+                index = 0
+                if header and header[0].strip().startswith("http"):
+                    yield header[0].strip()
+            for row in reader:
+                if len(row) > index and row[index].strip():
+                    yield row[index].strip()
+        elif extension in (".jsonl", ".ndjson"):
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    url = json.loads(line).get(column)
+                except (ValueError, AttributeError):
+                    print(f"Skipping malformed line: {line[:80]}")
+                    continue
+                if url:
+                    yield url.strip()
+        else:
+            for line in f:
+                if line.strip():
+                    yield line.strip()
+
+class Checkpoint:
+    """Append-only log of finished URLs ("ok<TAB>url" or "error<TAB>url")"""
+    
+    def __init__(self, path: str, retry_failed: bool = False):
+        self.path = path
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    status, _, url = line.rstrip('\n').partition('\t')
+                    if url and (status == "ok" or not retry_failed):
+                        self.done.add(url)
+        self._file = open(path, 'a', encoding='utf-8')
+    
+    def record(self, rows: List[dict]):
+        for row in rows:
+            self._file.write(f"{'error' if row['error'] else 'ok'}\t{row['url']}\n")
+            self.done.add(row['url'])
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    def close(self):
+        self._file.close()
+
+class JsonlWriter:
+    def __init__(self, path: str):
+        self._file = open(path, 'a', encoding='utf-8')
+    
+    def write(self, rows: List[dict]):
+        for row in rows:
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    def close(self):
+        self._file.close()
+
+# Output row columns (url, SocialMediaData.to_dict(), error, scraped_at) as pyarrow type aliases.
+# Every part file uses this schema: inferred per batch, a column that is None throughout
+# one batch would be typed null and the part files would no longer read as one dataset.
+PARQUET_COLUMNS = {
+    "url": "string",
+    "platform": "string",
+    "username": "string",
+    "followers": "int64",
+    "following": "int64",
+    "posts": "int64",
+    "bio": "string",
+    "profile_url": "string",
+    "is_private": "bool",
+    "is_verified": "bool",
+    "profile_picture": "string",
+    "stale": "bool",
+    "error": "string",
+    "scraped_at": "float64",
+}
+
+class ParquetWriter:
+    """Writes each batch as a new part file in the output directory, so resumed runs append"""
+    
+    def __init__(self, directory: str):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("Parquet output requires pyarrow: pip3 install pyarrow")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.schema = pa.schema([(name, pa.type_for_alias(alias)) for name, alias in PARQUET_COLUMNS.items()])
+        self._part = len([name for name in os.listdir(directory) if name.endswith(".parquet")])
+    
+    def write(self, rows: List[dict]):
+        path = os.path.join(self.directory, f"part-{self._part:05d}.parquet")
+        pq.write_table(pa.Table.from_pylist(rows, schema=self.schema), path)
+        self._part += 1
+    
+    def close(self):
+        pass
+
+class BulkScraper:
+    """Concurrent scrape loop with bounded in-flight work and batched, checkpointed output
+    
+    Results are written before their URLs are checkpointed, so a crash can at worst
+    repeat the last unflushed batch on resume, never lose it.
+    """
+    
+    def __init__(self, writer, checkpoint: Checkpoint, concurrency: int = 4,
+                 rate: Optional[float] = None, platform_rates: Optional[Dict[str, float]] = None,
+                 batch_size: int = 100, use_selenium: bool = False, request_delay=(0.0, 0.0),
+                 timeout: Optional[float] = None):
+        self.writer = writer
+        self.checkpoint = checkpoint
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.use_selenium = use_selenium
+        self.request_delay = request_delay
+        self.timeout = timeout
+        # One proxy pool for all workers, so per-proxy budgets, health scores and
+        # sticky assignments hold across the whole run
+        self.proxy_pool = ProxyPool.from_env()
+        # Likewise one warm session pool, so workers rotate the same sessions and
+        # never overwrite each other's session store
+        self.session_pool = SessionPool.from_env()
+        self.global_limit = TokenBucket(rate) if rate else None
+        self.platform_limits = {platform: TokenBucket(r) for platform, r in (platform_rates or {}).items()}
+        self.stats = {"scraped": 0, "ok": 0, "error": 0, "skipped": 0}
+        self._pending: List[dict] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._slots = threading.BoundedSemaphore(concurrency * 2)
+        self._stopping = threading.Event()
+        # First exception raised by a worker (e.g. disk full while flushing a batch)
+        self._failure: Optional[BaseException] = None
+    
+    def _scraper(self) -> SocialMediaScraper:
+        scraper = getattr(self._local, "scraper", None)
+        if scraper is None:
+            scraper = self._local.scraper = SocialMediaScraper.from_env(
+                use_selenium=self.use_selenium,
+                save_debug_html=False,
+                request_delay=self.request_delay,
+                proxy_pool=self.proxy_pool,
+                session_pool=self.session_pool,
+            )
+        return scraper
+    
+    def _scrape(self, url: str):
+        try:
+            if self._stopping.is_set():
+                return
+            platform = platform_from_host(urlparse(url).netloc)
+            if self.global_limit:
+                self.global_limit.acquire()
+            if platform in self.platform_limits:
+                self.platform_limits[platform].acquire()
+            try:
+                deadline = time.monotonic() + self.timeout if self.timeout else None
+                result = self._scraper().scrape_from_url(url, deadline)
+            except Exception as e:
+                result = SocialMediaData(
+                    platform=platform or "UNKNOWN", username="", followers=None, following=None,
+                    posts=None, bio="", profile_url=url, is_private=False, is_verified=False,
+                    profile_picture="", error=str(e)
+                )
+            row = {"url": url, **result.to_dict(), "error": result.error, "scraped_at": time.time()}
+            with self._lock:
+                self.stats["scraped"] += 1
+                self.stats["error" if result.error else "ok"] += 1
+                self._pending.append(row)
+                if len(self._pending) >= self.batch_size:
+                    self._flush_locked()
+        finally:
+            self._slots.release()
+    
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        self.writer.write(rows)
+        self.checkpoint.record(rows)
+        print(f"Progress: {self.stats['scraped']} scraped ({self.stats['ok']} ok, "
+              f"{self.stats['error']} errors), {self.stats['skipped']} already done")
+    
+    def _check(self, future: Future):
+        """Done callback: stop the run on the first worker exception instead of dropping it"""
+        error = future.exception()
+        if error is not None and self._failure is None:
+            self._failure = error
+            self._stopping.set()
+    
+    def run(self, urls: Iterator[str]):
+        """Scrape every URL not yet checkpointed; raises RuntimeError if writing results fails"""
+        seen: Set[str] = set()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            try:
+                for url in urls:
+                    if self._failure is not None:
+                        break
+                    if url in self.checkpoint.done or url in seen:
+                        self.stats["skipped"] += 1
+                        continue
+                    seen.add(url)
+                    # Bounded submission keeps memory flat however large the input is
+                    self._slots.acquire()
+                    pool.submit(self._scrape, url).add_done_callback(self._check)
+            except KeyboardInterrupt:
+                print("Interrupted: finishing in-flight scrapes and saving progress...")
+                self._stopping.set()
+        if self._failure is not None:
+            # The failed batch was never checkpointed, so a rerun scrapes it again
+            raise RuntimeError(f"Aborted, results could not be saved: {self._failure}") from self._failure
+        with self._lock:
+            self._flush_locked()
+        if self.session_pool:
+            self.session_pool.save()
+
+def parse_platform_rates(values: List[str]) -> Dict[str, float]:
+    rates = {}
+    for value in values:
+        platform, _, rate = value.partition('=')
+        rates[platform.strip().upper()] = float(rate)
+    return rates
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape profile URLs in bulk with checkpointed, resumable output")
+    parser.add_argument("input", help="URLs as .csv, .jsonl or plain text (one per line)")
+    parser.add_argument("output", help="Results .jsonl file, or a directory of part files with --format parquet")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default=None,
+                        help="Output format (default: parquet if output ends in .parquet, else jsonl)")
+    parser.add_argument("--column", default="url", help="CSV column / JSON field holding the URL")
+    parser.add_argument("--concurrency", type=int, default=4, help="Scrapes in flight")
+    parser.add_argument("--rate", type=float, default=None, help="Global limit in scrapes per second")
+    parser.add_argument("--platform-rate", action="append", default=[], metavar="PLATFORM=RATE",
+                        help="Per-platform limit in scrapes per second, e.g. instagram=0.5 (repeatable)")
+    parser.add_argument("--batch-size", type=int, default=100, help="Results per write and checkpoint")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--retry-failed", action="store_true", help="Re-scrape URLs that failed in earlier runs")
+    parser.add_argument("--selenium", action="store_true", help="Allow the Selenium fallback (one browser per worker)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Seconds allowed per profile, including URL variants and fallbacks")
+    parser.add_argument("--delay", type=float, nargs=2, default=(0.0, 0.0), metavar=("MIN", "MAX"),
+                        help="Extra random delay before each request, in seconds")
+    args = parser.parse_args()
+
+    output_format = args.format or ("parquet" if args.output.endswith(".parquet") else "jsonl")
+    writer = ParquetWriter(args.output) if output_format == "parquet" else JsonlWriter(args.output)
+    checkpoint = Checkpoint(args.checkpoint or f"{args.output.rstrip('/')}.checkpoint", args.retry_failed)
+    if checkpoint.done:
+        print(f"Resuming: {len(checkpoint.done)} URLs already completed")
+
+    bulk = BulkScraper(
+        writer, checkpoint,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        platform_rates=parse_platform_rates(args.platform_rate),
+        batch_size=args.batch_size,
+        use_selenium=args.selenium,
+        request_delay=tuple(args.delay),
+        timeout=args.timeout,
+    )
+    started = time.time()
+    try:
+        bulk.run(iter_urls(args.input, args.column))
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        writer.close()
+        checkpoint.close()
+    elapsed = time.time() - started
+    print(f"Done in {elapsed:.1f}s: {bulk.stats['ok']} ok, {bulk.stats['error']} errors, "
+          f"{bulk.stats['skipped']} skipped")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
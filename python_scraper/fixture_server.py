@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Local fixture-replay origin for offline load testing
+Serves the captured debug_*.html pages, plus the synthetic profiles in fixtures/,
+in place of the real social networks
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from scraper import platform_from_host
+
+FIXTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Hand-written profile pages with real counts, so load tests also cover successful
+# scrapes (the captured pages are mostly login walls that extract nothing)
+SYNTHETIC_FIXTURE_DIR = os.path.join(FIXTURE_DIR, "fixtures")
+
+@dataclass
+class FixtureBehavior:
+    """Latency and failure injection applied to every replayed response"""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    short_body_rate: float = 0.0
+
+def load_fixtures(fixture_dir: str = FIXTURE_DIR,
+                  synthetic_dir: Optional[str] = SYNTHETIC_FIXTURE_DIR) -> Dict[Tuple[str, str], List[bytes]]:
+    """Load debug_{platform}_{username}_{timestamp}.html files keyed by (platform, username)"""
+    fixtures: Dict[Tuple[str, str], List[bytes]] = {}
+    paths = glob.glob(os.path.join(fixture_dir, "debug_*.html"))
+    if synthetic_dir:
+        paths += glob.glob(os.path.join(synthetic_dir, "debug_*.html"))
+    for path in sorted(paths):
+        name = os.path.basename(path)[len("debug_"):-len(".html")]
+        platform, _, rest = name.partition('_')
+        username = rest.rsplit('_', 1)[0]
+        with open(path, 'rb') as f:
+            fixtures.setdefault((platform.upper(), username.lower()), []).append(f.read())
+    return fixtures
+
+class FixtureServer:
+    """Threaded HTTP server replaying fixtures for URLs rewritten by SocialMediaScraper.origin_override
+
+    Requests look like /<real host>/<username>/..., e.g. /www.instagram.com/instagram/.
+    Absolute-form request lines (GET http://127.0.0.1:port/...) are accepted too, so the
+    server can also stand in for an HTTP proxy.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 behavior: Optional[FixtureBehavior] = None,
+                 fixture_dir: str = FIXTURE_DIR):
+        self.behavior = behavior or FixtureBehavior()
+        self.fixtures = load_fixtures(fixture_dir)
+        if not self.fixtures:
+            raise ValueError(f"No debug_*.html fixtures found in {fixture_dir}")
+        self.stats: Dict[str, int] = {"requests": 0, "200": 0, "304": 0, "404": 0, "429": 0, "500": 0, "short": 0}
+        self._stats_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _choose_fixture(self, path: str) -> Optional[bytes]:
+        parsed = urlparse(path)
+        segments = [s for s in parsed.path.split('/') if s]
+        if not segments:
+            return None
+        platform = platform_from_host(segments[0])
+        if not platform:
+            return None
+        username = segments[1].lstrip('@').lower() if len(segments) > 1 else ""
+        pages = self.fixtures.get((platform, username))
+        if not pages:
+            # Unknown profile: replay any capture from the same platform
+            pages = [page for (p, _), items in self.fixtures.items() if p == platform for page in items]
+        return random.choice(pages) if pages else None
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                behavior = server.behavior
+                server._count("requests")
+                delay = behavior.latency_ms + random.uniform(0, behavior.jitter_ms)
+                if delay > 0:
+                    time.sleep(delay / 1000.0)
+
+                roll = random.random()
+                if roll < behavior.error_rate:
+                    server._count("500")
+                    self._send(500, b"Internal Server Error")
+                    return
+                roll -= behavior.error_rate
+                if roll < behavior.rate_limit_rate:
+                    server._count("429")
+                    self._send(429, b"Too Many Requests", {"Retry-After": "1"})
+                    return
+                roll -= behavior.rate_limit_rate
+                if roll < behavior.short_body_rate:
+                    server._count("short")
+                    self._send(200, b"<html><body>Please wait...</body></html>")
+                    return
+
+                page = server._choose_fixture(self.path)
+                if page is None:
+                    server._count("404")
+                    self._send(404, b"Not Found")
+                    return
+                # Fixtures are immutable, so a content hash makes a valid ETag
+                etag = '"' + hashlib.blake2b(page, digest_size=8).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    server._count("304")
+                    self._send(304, b"", {"ETag": etag})
+                    return
+                server._count("200")
+                self._send(200, page, {"ETag": etag})
+
+        return Handler
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+def add_behavior_arguments(parser: argparse.ArgumentParser):
+    """Register the failure-injection flags shared with load_test.py"""
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base latency added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform random latency added on top")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of responses returned as HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of responses returned as HTTP 429")
+    parser.add_argument("--short-body-rate", type=float, default=0.0, help="Fraction of responses with a short placeholder body")
+
+def behavior_from_args(args: argparse.Namespace) -> FixtureBehavior:
+    return FixtureBehavior(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        short_body_rate=args.short_body_rate,
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured debug_*.html pages as a local origin")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixture-dir", default=FIXTURE_DIR)
+    add_behavior_arguments(parser)
+    args = parser.parse_args()
+
+    server = FixtureServer(args.host, args.port, behavior_from_args(args), args.fixture_dir)
+    print(f"Replaying {sum(len(v) for v in server.fixtures.values())} fixtures at {server.url}")
+    print(f"Point the scraper at it with SCRAPER_ORIGIN_OVERRIDE={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Background job queue for long-running scrapes
+Jobs run on a bounded asyncio queue drained by a fixed number of workers
+"""
+
+import asyncio
+import ipaddress
+import json
+import socket
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Collection, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from fastapi.concurrency import run_in_threadpool
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from scraper import SocialMediaData
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+def _is_public(address: str) -> bool:
+    return ipaddress.ip_address(address.split('%')[0]).is_global
+
+def check_callback_url(url: str, allowed_hosts: Optional[Collection[str]] = None, resolve: bool = True):
+    """Raise ValueError unless url is a safe target for the result POST
+    
+    With allowed_hosts only those hostnames are accepted. Otherwise any http(s)
+    host is accepted as long as none of its addresses are private, loopback,
+    link-local or reserved, so callers cannot point the server at internal services.
+    resolve=False skips the DNS lookup (it blocks), checking the URL alone.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValueError("callback_url must be an http(s) URL")
+    host = parsed.hostname.lower()
+    if allowed_hosts:
+        if host not in allowed_hosts:
+            raise ValueError(f"callback_url host {host} is not allowed")
+        return
+    if not resolve:
+        return
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, parsed.port or None)}
+    except socket.gaierror:
+        raise ValueError(f"callback_url host {host} does not resolve")
+    for address in addresses:
+        if not _is_public(address):
+            raise ValueError(f"callback_url host {host} resolves to a non-public address")
+
+class _PublicPeerMixin:
+    """Refuses a connection once the socket is open if the peer is not a public address
+    
+    Checking the connected peer, rather than a DNS answer looked up beforehand,
+    means a host that re-resolves to an internal address (DNS rebinding) is caught.
+    """
+    
+    def _new_conn(self):
+        sock = super()._new_conn()
+        address = sock.getpeername()[0]
+        if not _is_public(address):
+            sock.close()
+            raise OSError(f"Refusing to connect to non-public address {address}")
+        return sock
+
+class _PublicHTTPConnection(_PublicPeerMixin, HTTPConnection):
+    pass
+
+class _PublicHTTPSConnection(_PublicPeerMixin, HTTPSConnection):
+    pass
+
+class _PublicHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _PublicHTTPConnection
+
+class _PublicHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _PublicHTTPSConnection
+
+class PublicOnlyAdapter(HTTPAdapter):
+    """requests transport that only ever connects to public addresses"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _PublicHTTPConnectionPool,
+            "https": _PublicHTTPSConnectionPool,
+        }
+
+@dataclass
+class Job:
+    id: str
+    url: str
+    callback_url: Optional[str] = None
+    timeout: Optional[float] = None
+    status: str = "queued"  # queued | running | completed | failed
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[SocialMediaData] = None
+    error: Optional[str] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "url": self.url,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "data": self.result.to_dict() if self.result and not self.error else None,
+            "error": self.error,
+        }
+
+class JobManager:
+    """Bounded scrape queue with polling, SSE and callback delivery of results"""
+    
+    def __init__(self, scrape: Callable[[str, Optional[float]], SocialMediaData], workers: int = 2,
+                 max_queue: int = 100, retention_seconds: float = 3600.0,
+                 on_result: Optional[Callable[[SocialMediaData], None]] = None,
+                 callback_hosts: Optional[Collection[str]] = None):
+        self.scrape = scrape
+        self.on_result = on_result
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retention_seconds = retention_seconds
+        # Hostnames callbacks may target; empty means any public http(s) host
+        self.callback_hosts = {host.lower() for host in callback_hosts or ()}
+        # Callbacks never go through environment proxies, and without an allowlist
+        # they can only connect to public addresses
+        self._callback_session = requests.Session()
+        self._callback_session.trust_env = False
+        if not self.callback_hosts:
+            self._callback_session.mount("http://", PublicOnlyAdapter())
+            self._callback_session.mount("https://", PublicOnlyAdapter())
+        self.jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+    
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+    
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+    
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+    
+    def submit(self, url: str, callback_url: Optional[str] = None, timeout: Optional[float] = None,
+               reserve: int = 0) -> Job:
+        """Queue a scrape, raising QueueFullError instead of waiting when at capacity
+        
+        timeout bounds the scrape itself, counted from when a worker picks it up.
+        reserve treats the queue as full while no more than that many slots are free,
+        so background work leaves room for user jobs.
+        Raises ValueError for a callback_url that is not http(s) or not allowlisted;
+        await check_callback first to also reject hosts that resolve to internal addresses.
+        """
+        if self._queue is None:
+            raise RuntimeError("JobManager has not been started")
+        if callback_url:
+            check_callback_url(callback_url, self.callback_hosts, resolve=False)
+        self._prune()
+        job = Job(id=uuid.uuid4().hex, url=url, callback_url=callback_url, timeout=timeout)
+        if reserve and self.max_queue - self._queue.qsize() <= reserve:
+            raise QueueFullError(f"Job queue is nearly full ({self._queue.qsize()} pending)")
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Job queue is full ({self.max_queue} pending)")
+        self.jobs[job.id] = job
+        return job
+    
+    async def check_callback(self, callback_url: str):
+        """check_callback_url with its DNS lookup run off the event loop"""
+        await run_in_threadpool(check_callback_url, callback_url, self.callback_hosts)
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+    
+    def is_pending(self, url: str) -> bool:
+        """Whether a job for url is already queued or running"""
+        return any(job.url == url and job.status in ("queued", "running") for job in self.jobs.values())
+    
+    async def events(self, job: Job, keepalive: float = 15.0) -> AsyncIterator[str]:
+        """Server-sent events: the current status, then the final result"""
+        yield f"event: status\ndata: {json.dumps(job.to_dict())}\n\n"
+        while not job.done.is_set():
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+        yield f"event: {job.status}\ndata: {json.dumps(job.to_dict())}\n\n"
+    
+    def _prune(self):
+        """Forget finished jobs older than the retention window"""
+        cutoff = time.time() - self.retention_seconds
+        expired = [job_id for job_id, job in self.jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self.jobs[job_id]
+    
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+    
+    async def _run(self, job: Job):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            deadline = time.monotonic() + job.timeout if job.timeout else None
+            job.result = await run_in_threadpool(self.scrape, job.url, deadline)
+            job.error = job.result.error
+        except Exception as e:
+            job.error = f"Scraping failed: {str(e)}"
+        job.status = "failed" if job.error else "completed"
+        job.finished_at = time.time()
+        job.done.set()
+        
+        if job.result is not None and self.on_result:
+            try:
+                self.on_result(job.result)
+            except Exception as e:
+                print(f"Result handler failed for job {job.id}: {e}")
+        
+        if job.callback_url:
+            await run_in_threadpool(self._send_callback, job)
+    
+    def _send_callback(self, job: Job):
+        try:
+            # The session's transport re-checks the address actually connected to
+            self._callback_session.post(job.callback_url, json=job.to_dict(), timeout=10, allow_redirects=False)
+        except Exception as e:
+            print(f"Callback to {job.callback_url} failed for job {job.id}: {e}")
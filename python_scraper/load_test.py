@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test for the scraper API
+Runs api_server.py against the local fixture-replay origin and drives /api/scrape
+at a controlled concurrency, reporting latency percentiles and throughput
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+from fixture_server import FixtureServer, add_behavior_arguments, behavior_from_args
+from scraper import PROFILE_URL_TEMPLATES
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def spawn_api_server(origin: str, port: int) -> subprocess.Popen:
+    """Start api_server.py under uvicorn, pointed at the fixture origin"""
+    env = dict(os.environ)
+    env.update({
+        "SCRAPER_ORIGIN_OVERRIDE": origin,
+        "SCRAPER_USE_SELENIUM": "0",
+        "SCRAPER_SAVE_DEBUG_HTML": "0",
+        "SCRAPER_REQUEST_DELAY": "0",
+    })
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api_server:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=SCRIPT_DIR, env=env,
+    )
+
+def wait_for_health(api_url: str, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{api_url}/health", timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"API server at {api_url} did not become healthy")
+
+def run_load(api_url: str, urls: List[str], total: int, concurrency: int,
+             timeout: float) -> Dict[str, object]:
+    """Send `total` scrape requests with at most `concurrency` in flight"""
+    latencies: List[float] = []
+    success_latencies: List[float] = []
+    counts = {"success": 0, "scrape_error": 0, "http_error": 0}
+    lock = threading.Lock()
+    local = threading.local()
+
+    def one(i: int):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        started = time.perf_counter()
+        try:
+            response = session.post(f"{api_url}/api/scrape", json={"url": urls[i % len(urls)]}, timeout=timeout)
+            outcome = "success" if response.ok and response.json().get("success") else (
+                "scrape_error" if response.ok else "http_error")
+        except requests.RequestException:
+            outcome = "http_error"
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            if outcome == "success":
+                success_latencies.append(elapsed)
+            counts[outcome] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    success_latencies.sort()
+    return {
+        **counts,
+        "requests": total,
+        "concurrency": concurrency,
+        "wall_seconds": wall,
+        "throughput_rps": total / wall if wall > 0 else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": (latencies[-1] * 1000) if latencies else 0.0,
+        "success_p50_ms": percentile(success_latencies, 50) * 1000,
+        "success_p95_ms": percentile(success_latencies, 95) * 1000,
+        "success_p99_ms": percentile(success_latencies, 99) * 1000,
+    }
+
+def print_report(report: Dict[str, object], fixture_stats: Optional[Dict[str, int]] = None):
+    print("Load test results")
+    print("=" * 50)
+    print(f"Requests:    {report['requests']} at concurrency {report['concurrency']}")
+    print(f"Outcomes:    {report['success']} ok, {report['scrape_error']} scrape errors, {report['http_error']} HTTP errors")
+    print(f"Wall time:   {report['wall_seconds']:.2f}s")
+    print(f"Throughput:  {report['throughput_rps']:.2f} req/s")
+    print(f"Latency:     p50 {report['p50_ms']:.1f}ms | p95 {report['p95_ms']:.1f}ms | "
+          f"p99 {report['p99_ms']:.1f}ms | max {report['max_ms']:.1f}ms")
+    if report['success']:
+        print(f"Successes:   p50 {report['success_p50_ms']:.1f}ms | p95 {report['success_p95_ms']:.1f}ms | "
+              f"p99 {report['success_p99_ms']:.1f}ms")
+    if fixture_stats:
+        print(f"Origin:      {fixture_stats}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test /api/scrape against replayed fixtures")
+    parser.add_argument("--requests", type=int, default=200, help="Total scrape requests to send")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests kept in flight")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request client timeout in seconds")
+    parser.add_argument("--api-url", default=None,
+                        help="Use an already running API (started with SCRAPER_ORIGIN_OVERRIDE) instead of spawning one")
+    add_behavior_arguments(parser)
+    args = parser.parse_args()
+
+    fixture_server = FixtureServer(behavior=behavior_from_args(args)).start()
+    urls = [PROFILE_URL_TEMPLATES[platform].format(username=username)
+            for platform, username in sorted(fixture_server.fixtures) if platform in PROFILE_URL_TEMPLATES]
+
+    api_process = None
+    api_url = args.api_url
+    try:
+        if not api_url:
+            port = _free_port()
+            api_url = f"http://127.0.0.1:{port}"
+            api_process = spawn_api_server(fixture_server.url, port)
+        wait_for_health(api_url)
+        print(f"Fixture origin {fixture_server.url}, API {api_url}, {len(urls)} profile URLs")
+        report = run_load(api_url, urls, args.requests, args.concurrency, args.timeout)
+        print_report(report, fixture_server.stats)
+    finally:
+        if api_process:
+            api_process.terminate()
+            api_process.wait(timeout=10)
+        fixture_server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Opt-in profiling for the scrape pipeline
+Per-request cProfile captures and a global low-overhead stack sampler
+"""
+
+import cProfile
+import glob
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# cProfile cannot trace overlapping calls reliably, so only one request is profiled at a time
+_profile_lock = threading.Lock()
+
+# Profile files kept per output directory and kind; older ones are deleted
+PROFILE_KEEP = int(os.getenv("SCRAPER_PROFILE_KEEP", "50"))
+
+def _prune(output_dir: str, pattern: str, keep: int):
+    """Delete all but the newest `keep` files matching pattern in output_dir"""
+    paths = sorted(glob.glob(os.path.join(output_dir, pattern)), key=os.path.getmtime)
+    for path in paths[:max(len(paths) - keep, 0)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def profile_call(fn: Callable, *args, output_dir: Optional[str] = None, top: int = 25,
+                 keep: int = PROFILE_KEEP, **kwargs) -> Tuple[Any, Dict[str, Any]]:
+    """Run fn under cProfile and return (result, profile summary)
+    
+    The summary lists the top functions by cumulative time. When output_dir is set
+    the raw stats are also written there as a .prof file for snakeviz/pstats, and
+    only the newest `keep` of them are kept.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        return fn(*args, **kwargs), {"skipped": "Another profiled request is in progress"}
+    try:
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        result = profiler.runcall(fn, *args, **kwargs)
+        elapsed = time.perf_counter() - started
+    finally:
+        _profile_lock.release()
+    
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+    summary: Dict[str, Any] = {
+        "total_seconds": elapsed,
+        "functions": [
+            {
+                "function": f"{os.path.basename(filename)}:{line}({name})",
+                "calls": calls,
+                "tottime": tottime,
+                "cumtime": cumtime,
+            }
+            for (filename, line, name), (_, calls, tottime, cumtime, _) in rows
+        ],
+    }
+    
+    if output_dir:
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            path = os.path.join(output_dir, f"scrape-{int(time.time() * 1000)}.prof")
+            stats.dump_stats(path)
+            summary["file"] = path
+            _prune(output_dir, "scrape-*.prof", keep)
+        except Exception as e:
+            print(f"Failed to save profile: {e}")
+    return result, summary
+
+class StackSampler:
+    """Background sampler writing flamegraph-ready folded stacks
+    
+    Every `interval` seconds it records the Python stack of each thread; every
+    `dump_interval` seconds the counts are written to `output_dir` as
+    stacks-<timestamp>.folded ("frame;frame;frame count" per line), the input
+    format of flamegraph.pl, speedscope and inferno. Nothing runs unless start()
+    is called.
+    """
+    
+    def __init__(self, output_dir: str, interval: float = 0.01, dump_interval: float = 60.0):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.dump_interval = dump_interval
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @classmethod
+    def from_env(cls) -> Optional["StackSampler"]:
+        """Build a sampler if SCRAPER_SAMPLING_PROFILER=1, otherwise None"""
+        if os.getenv("SCRAPER_SAMPLING_PROFILER", "0") != "1":
+            return None
+        return cls(
+            output_dir=os.getenv("SCRAPER_PROFILE_DIR", "profiles"),
+            interval=float(os.getenv("SCRAPER_SAMPLING_INTERVAL_MS", "10")) / 1000.0,
+            dump_interval=float(os.getenv("SCRAPER_SAMPLING_DUMP_SECONDS", "60")),
+        )
+    
+    def start(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.dump()
+    
+    def _sample(self):
+        own_id = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.counts[";".join(reversed(stack))] += 1
+    
+    def _run(self):
+        next_dump = time.monotonic() + self.dump_interval
+        while not self._stop.wait(self.interval):
+            self._sample()
+            if time.monotonic() >= next_dump:
+                self.dump()
+                next_dump = time.monotonic() + self.dump_interval
+    
+    def dump(self):
+        """Write and reset the accumulated stack counts"""
+        if not self.counts:
+            return
+        counts, self.counts = self.counts, Counter()
+        path = os.path.join(self.output_dir, f"stacks-{int(time.time())}.folded")
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                for stack, count in counts.most_common():
+                    f.write(f"{stack} {count}\n")
+            _prune(self.output_dir, "stacks-*.folded", PROFILE_KEEP)
+        except Exception as e:
+            print(f"Failed to write stack samples: {e}")
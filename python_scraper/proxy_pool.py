@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Proxy pool for outgoing scrapes
+Scores each proxy by success rate and latency, ejects failing proxies for a
+cooldown, and enforces per-proxy concurrency and request-rate budgets
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from rate_limit import TokenBucket
+
+@dataclass(eq=False)
+class Proxy:
+    url: str
+    max_concurrency: int = 4
+    bucket: Optional[TokenBucket] = field(default=None, repr=False)
+    score: float = 1.0  # moving average of successes (1) and failures (0)
+    latency: Optional[float] = None  # moving average of request seconds
+    in_flight: int = 0
+    requests: int = 0
+    failures: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+    
+    def as_requests(self) -> Dict[str, str]:
+        return {"http": self.url, "https": self.url}
+    
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "score": round(self.score, 3),
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+            "ejected": self.ejected_until > time.monotonic(),
+        }
+
+class ProxyPool:
+    """Thread-safe pool handing out healthy proxies, sticky per platform
+    
+    A proxy whose score falls below eject_below is taken out of rotation for
+    cooldown seconds, doubling with each consecutive ejection (up to max_cooldown).
+    After the cooldown it is re-admitted on probation: its score restarts at the
+    ejection threshold, so a couple of successes restore it and a single failure
+    ejects it again, for twice as long.
+    """
+    
+    def __init__(self, urls: List[str], max_concurrency: int = 4, rate: Optional[float] = None,
+                 eject_below: float = 0.3, cooldown: float = 30.0, max_cooldown: float = 600.0,
+                 smoothing: float = 0.2):
+        if not urls:
+            raise ValueError("ProxyPool needs at least one proxy")
+        self.proxies = [
+            Proxy(url=url, max_concurrency=max_concurrency, bucket=TokenBucket(rate) if rate else None)
+            for url in dict.fromkeys(urls)
+        ]
+        self.eject_below = eject_below
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.smoothing = smoothing
+        self._sticky: Dict[str, Proxy] = {}
+        self._condition = threading.Condition()
+    
+    @classmethod
+    def from_file(cls, path: str, **options) -> "ProxyPool":
+        """One proxy URL per line; blank lines and # comments are ignored"""
+        with open(path, encoding='utf-8') as f:
+            urls = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+        return cls(urls, **options)
+    
+    @classmethod
+    def from_env(cls) -> Optional["ProxyPool"]:
+        """Build a pool from SCRAPER_PROXIES / SCRAPER_PROXY_FILE, or None if neither is set"""
+        urls = [url.strip() for url in os.getenv("SCRAPER_PROXIES", "").split(',') if url.strip()]
+        path = os.getenv("SCRAPER_PROXY_FILE")
+        if path:
+            with open(path, encoding='utf-8') as f:
+                urls += [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+        if not urls:
+            return None
+        rate = os.getenv("SCRAPER_PROXY_RATE")
+        return cls(
+            urls,
+            max_concurrency=int(os.getenv("SCRAPER_PROXY_CONCURRENCY", "4")),
+            rate=float(rate) if rate else None,
+        )
+    
+    def _usable(self, proxy: Proxy, now: float) -> bool:
+        if proxy.ejected_until > now or proxy.in_flight >= proxy.max_concurrency:
+            return False
+        if proxy.ejected_until and proxy.score < self.eject_below:
+            # Cooldown over: re-admit on probation, one failure away from ejection
+            proxy.score = self.eject_below
+        return True
+    
+    def _rank(self, proxy: Proxy) -> float:
+        # Prefer healthy, fast and idle proxies
+        latency = proxy.latency if proxy.latency is not None else 1.0
+        return proxy.score / (latency + 0.1) / (1 + proxy.in_flight)
+    
+    def acquire(self, key: str, timeout: Optional[float] = None) -> Optional[Proxy]:
+        """Reserve a proxy for one request, preferring the one last used for key
+        
+        Waits for a concurrency slot or rate budget to free up; returns None if
+        none does within timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                sticky = self._sticky.get(key)
+                candidates = [p for p in self.proxies if self._usable(p, now)]
+                if sticky in candidates:
+                    candidates.remove(sticky)
+                    candidates.insert(0, sticky)
+                else:
+                    candidates.sort(key=self._rank, reverse=True)
+                for proxy in candidates:
+                    if proxy.bucket is None or proxy.bucket.try_acquire():
+                        proxy.in_flight += 1
+                        self._sticky[key] = proxy
+                        return proxy
+                
+                if deadline is not None and now >= deadline:
+                    return None
+                # Rate budgets refill without notifying, so poll at a short interval
+                wait = 0.05 if deadline is None else min(0.05, deadline - now)
+                self._condition.wait(timeout=max(wait, 0.0))
+    
+    def release(self, proxy: Proxy, ok: Optional[bool], latency: Optional[float] = None):
+        """Return a proxy and record the outcome of the request made through it
+        
+        ok=None returns a proxy that was never used, without affecting its score.
+        """
+        with self._condition:
+            proxy.in_flight = max(0, proxy.in_flight - 1)
+            if ok is None:
+                self._condition.notify_all()
+                return
+            proxy.requests += 1
+            proxy.score += self.smoothing * ((1.0 if ok else 0.0) - proxy.score)
+            if latency is not None and ok:
+                proxy.latency = latency if proxy.latency is None else (
+                    proxy.latency + self.smoothing * (latency - proxy.latency))
+            if ok:
+                if proxy.score > 0.8:
+                    proxy.ejections = 0
+            else:
+                proxy.failures += 1
+                if proxy.score < self.eject_below:
+                    cooldown = min(self.max_cooldown, self.cooldown * (2 ** proxy.ejections))
+                    proxy.ejections += 1
+                    proxy.ejected_until = time.monotonic() + cooldown
+                    print(f"Ejecting proxy {proxy.url} for {cooldown:.0f}s (score {proxy.score:.2f})")
+                    for key, sticky in list(self._sticky.items()):
+                        if sticky is proxy:
+                            del self._sticky[key]
+            self._condition.notify_all()
+    
+    def snapshot(self) -> List[dict]:
+        with self._condition:
+            return [proxy.to_dict() for proxy in self.proxies]
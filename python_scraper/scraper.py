@@ -5,13 +5,19 @@ Free alternative to paid APIs - extracts data directly from social media profile
 """
 
 import requests
+import hashlib
+import os
 import re
 import json
+import threading
 import time
 from urllib.parse import urlparse
-from typing import Dict, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple, Union
 import random
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from proxy_pool import ProxyPool
+from session_pool import WARMUP_URLS, SessionPool, is_login_wall
 
 # Try to import Selenium for JavaScript rendering
 try:
@@ -27,6 +33,148 @@ except ImportError:
     SELENIUM_AVAILABLE = False
     print("Warning: Selenium not available. Using basic scraping only.")
 
+# Pages are parsed as raw response bytes (HTTP tier) or str (Selenium page_source).
+# Every pattern is compiled for both so extraction never has to decode or copy the page.
+Page = Union[str, bytes]
+
+# In bytes patterns \s is ASCII-only, while str patterns also match Unicode spaces such as
+# the no-break spaces in "1,234\xa0followers". This is every str \s match, as UTF-8.
+_BYTES_SPACE = (r'(?:[\s\x1c-\x1f]|\xc2[\x85\xa0]|\xe1\x9a\x80'
+                r'|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80)')
+
+def _compile_one(pattern: str) -> Tuple[Pattern, Pattern]:
+    # JSON whitespace is ASCII-only (RFC 8259), so patterns anchored on a quoted JSON key
+    # keep an ASCII \s in both variants. Only free text pays for the UTF-8 alternation,
+    # which is tried at every position a count could start.
+    if pattern.startswith('"'):
+        return (re.compile(pattern, re.IGNORECASE | re.ASCII),
+                re.compile(pattern.encode('utf-8'), re.IGNORECASE))
+    return (re.compile(pattern, re.IGNORECASE),
+            re.compile(pattern.replace(r'\s', _BYTES_SPACE).encode('utf-8'), re.IGNORECASE))
+
+def _compile(patterns) -> Tuple[List[Pattern], List[Pattern]]:
+    # A repeated pattern can only repeat the earlier miss, so drop duplicates
+    compiled = [_compile_one(p) for p in dict.fromkeys(patterns)]
+    return [c[0] for c in compiled], [c[1] for c in compiled]
+
+def _compile_terms(terms) -> Tuple[Pattern, Pattern]:
+    alternation = '|'.join(re.escape(term) for term in terms)
+    return (
+        re.compile(alternation, re.IGNORECASE),
+        re.compile(alternation.encode('utf-8'), re.IGNORECASE),
+    )
+
+def _pick(compiled, html: Page):
+    """Select the str or bytes variant of compiled patterns for this page"""
+    return compiled[1] if isinstance(html, (bytes, bytearray, memoryview)) else compiled[0]
+
+def _decode(value: Page) -> str:
+    """Decode a matched substring; only these small slices are ever decoded"""
+    if isinstance(value, str):
+        return value
+    return bytes(value).decode('utf-8', errors='replace')
+
+FOLLOWER_PATTERNS = _compile([
+    # Instagram specific patterns (modern)
+    r'"edge_followed_by"\s*:\s*{\s*"count"\s*:\s*([0-9]+)',
+    r'"edge_followed_by"\s*:\s*{\s*"count"\s*:\s*"?([0-9][0-9,\.]*)"?',
+    r'"followers"\s*:\s*"?([0-9][0-9,\.]*)"?',
+    r'"follower_count"\s*:\s*([0-9]+)',
+    r'"followers_count"\s*:\s*([0-9]+)',
+    r'"subscriberCount"\s*:\s*"?([0-9][0-9,\.]*)"?',
+    r'aria-label="([0-9][0-9,\.]*\s*[kmbtKMBT]?) followers"',
+    r'data-followers="([0-9,\.kmbtKMBT]+)"',
+    r'([0-9][0-9,\.]*\s*[kmbtKMBT]?)(?:\s+followers|\s+subscribers)',
+    r'([0-9,\.]+)\s*[KMBT]?\s*followers',
+    r'([0-9,\.]+)\s*[KMBT]?\s*subscribers',
+    # Twitter specific patterns (modern)
+    r'"followers_count"\s*:\s*([0-9]+)',
+    r'"followers_count"\s*:\s*"?([0-9][0-9,\.]*)"?',
+    r'"followers"\s*:\s*"?([0-9][0-9,\.]*)"?',
+    # Generic patterns
+    r'([0-9,\.]+)\s*[KMBT]?\s*followers',
+    r'([0-9,\.]+)\s*[KMBT]?\s*subscribers',
+    # New patterns for modern social media
+    r'([0-9,\.]+)\s*[KMBT]?\s*[Ff]ollowers?',
+    r'([0-9,\.]+)\s*[KMBT]?\s*[Ss]ubscribers?',
+    r'([0-9,\.]+)\s*[KMBT]?\s*[Mm]embers?'
+])
+
+POST_PATTERNS = _compile([
+    # Instagram specific patterns
+    r'"edge_owner_to_timeline_media"\s*:\s*{\s*"count"\s*:\s*([0-9]+)',
+    r'"media_count"\s*:\s*([0-9]+)',
+    r'"posts_count"\s*:\s*([0-9]+)',
+    # Twitter specific patterns
+    r'"statuses_count"\s*:\s*([0-9]+)',
+    r'"tweets_count"\s*:\s*([0-9]+)',
+    # Generic patterns
+    r'([0-9,\.]+)\s*posts?',
+    r'([0-9,\.]+)\s*videos?',
+    r'([0-9,\.]+)\s*media'
+])
+
+BIO_PATTERNS = _compile([
+    # Instagram specific patterns
+    r'"biography"\s*:\s*"([^"]+)"',
+    r'"biography"\s*:\s*"?([^"]+)"?',
+    # Twitter specific patterns
+    r'"description"\s*:\s*"([^"]+)"',
+    r'"description"\s*:\s*"?([^"]+)"?',
+    # Generic patterns
+    r'<meta\s+name="description"\s+content="([^"]+)"',
+    r'<title>([^<]+)</title>',
+    r'"bio"\s*:\s*"([^"]+)"',
+    r'"about"\s*:\s*"([^"]+)"'
+])
+
+INSTAGRAM_PRIVATE_TERMS = _compile_terms(['private', 'this account is private', 'content is private'])
+INSTAGRAM_VERIFIED_TERMS = _compile_terms(['verified', '✓', 'checkmark', 'blue badge'])
+TWITTER_PRIVATE_TERMS = _compile_terms(['protected', 'this account is protected', 'tweets are protected'])
+TWITTER_VERIFIED_TERMS = _compile_terms(['verified', '✓', 'checkmark', 'blue badge', 'blue checkmark'])
+GENERIC_VERIFIED_TERMS = _compile_terms(['verified'])
+
+# Page regions that can feed the fields we extract. Pages are fingerprinted on these
+# alone, so nonces, timestamps and tracking markup elsewhere do not defeat reuse.
+# The JSON keys are taken from the extractor patterns themselves, so a key added
+# there is fingerprinted too; text counts and terms mirror the generic patterns.
+_FINGERPRINT_KEYS = sorted({
+    key for compiled in (FOLLOWER_PATTERNS, POST_PATTERNS, BIO_PATTERNS)
+    for pattern in compiled[0] for key in re.findall(r'^"(\w+)"', pattern.pattern)
+} | {'is_private', 'is_verified'})
+FINGERPRINT_REGIONS = _compile([
+    # Markup: title, summary meta tags and count attributes
+    r'<title>[^<]*</title>'
+    r'|<meta[^>]+(?:name|property)="(?:description|og:description|og:title)"[^>]*>'
+    r'|(?:aria-label|data-followers)="[^"]{0,128}"',
+    # Embedded JSON values of the extracted keys
+    r'"(?:' + '|'.join(_FINGERPRINT_KEYS) + r')"\s*:\s*(?:\{[^{}]{0,64}\}|"[^"]*"|[0-9a-z]+)',
+    # Plain-text counts such as "1.2M followers" or "845 posts"
+    r'[0-9,\.]+\s*[kmbt]?\s*(?:followers?|subscribers?|members?|posts?|videos?|media)',
+])
+FINGERPRINT_TERMS = _compile_terms(['private', 'protected', 'verified', '✓', 'checkmark', 'blue badge'])
+
+# Canonical profile URL per platform, used to scrape a platform/username pair by URL
+PROFILE_URL_TEMPLATES = {
+    "INSTAGRAM": "https://www.instagram.com/{username}/",
+    "TWITTER": "https://twitter.com/{username}",
+    "YOUTUBE": "https://www.youtube.com/@{username}",
+    "LINKEDIN": "https://www.linkedin.com/in/{username}/",
+}
+
+def platform_from_host(host: str) -> Optional[str]:
+    """Map a hostname to its platform key, or None if unsupported"""
+    host = host.lower()
+    if 'instagram.com' in host:
+        return "INSTAGRAM"
+    if 'twitter.com' in host or 'x.com' in host:
+        return "TWITTER"
+    if 'youtube.com' in host:
+        return "YOUTUBE"
+    if 'linkedin.com' in host:
+        return "LINKEDIN"
+    return None
+
 @dataclass
 class SocialMediaData:
     platform: str
@@ -40,9 +188,133 @@ class SocialMediaData:
     is_verified: bool
     profile_picture: str
     error: Optional[str] = None
+    stale: bool = False  # True when served from cache because the deadline expired
+    
+    def to_dict(self) -> dict:
+        """Profile fields as returned by the API (without the error)"""
+        return {
+            "platform": self.platform,
+            "username": self.username,
+            "followers": self.followers,
+            "following": self.following,
+            "posts": self.posts,
+            "bio": self.bio,
+            "profile_url": self.profile_url,
+            "is_private": self.is_private,
+            "is_verified": self.is_verified,
+            "profile_picture": self.profile_picture,
+            "stale": self.stale
+        }
+
+class BoundedCache:
+    """Thread-safe LRU mapping used for per-profile scrape state
+    
+    With max_bytes and sizeof, entries are also evicted to keep the summed
+    sizeof(value) under max_bytes; a value larger than that is not stored.
+    """
+    
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None,
+                 sizeof: Optional[Callable[[object], int]] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes if sizeof else None
+        self.sizeof = sizeof
+        self.bytes = 0
+        self._items: "OrderedDict" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+    
+    def set(self, key, value):
+        with self._lock:
+            if key in self._items:
+                self._drop(key)
+            size = self.sizeof(value) if self.max_bytes is not None else 0
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._items[key] = value
+            self.bytes += size
+            while len(self._items) > self.max_entries or (
+                    self.max_bytes is not None and self.bytes > self.max_bytes):
+                self._drop(next(iter(self._items)))
+    
+    def _drop(self, key):
+        value = self._items.pop(key)
+        if self.max_bytes is not None:
+            self.bytes -= self.sizeof(value)
+    
+    def __len__(self) -> int:
+        return len(self._items)
+
+# Per-attempt time limits (seconds); with a deadline each is capped by the remaining budget
+REQUEST_TIMEOUT = 30
+SELENIUM_PAGE_LOAD_TIMEOUT = 30
+SELENIUM_SETTLE_SECONDS = 5
+SELENIUM_WAIT_SECONDS = 15
+# Attempts are skipped once less than this is left of the deadline
+MIN_ATTEMPT_SECONDS = 1.0
+# After a failed WebDriver setup, Selenium renders are skipped for this long before retrying
+SELENIUM_RETRY_SECONDS = 60
+# Responses that count against the proxy's health (blocked, auth, throttled); 5xx also do
+PROXY_FAILURE_STATUSES = (403, 407, 429)
+
+@dataclass
+class SeleniumRenderProfile:
+    """Resource-loading settings for a Selenium render of a profile page"""
+    page_load_strategy: str = "eager"
+    blocked_resource_types: Tuple[str, ...] = ("image", "media", "font")
+    window_size: Tuple[int, int] = (1024, 768)
+    disable_extensions: bool = True
+
+# URL patterns handed to Chrome's Network.setBlockedURLs for each resource type.
+# We only read page_source, so none of these are needed to extract counts.
+BLOCKED_URL_PATTERNS = {
+    "image": ["*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.m4s*", "*.mp3*", "*.m4a*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "stylesheet": ["*.css*"],
+}
+
+# Lean profile used for every platform unless overridden per platform, e.g.
+# SocialMediaScraper(selenium_profiles={"TWITTER": SeleniumRenderProfile(...)})
+DEFAULT_SELENIUM_PROFILES = {
+    "DEFAULT": SeleniumRenderProfile(),
+}
 
 class SocialMediaScraper:
-    def __init__(self):
+    def __init__(self,
+                 selenium_profiles: Optional[Dict[str, SeleniumRenderProfile]] = None,
+                 origin_override: Optional[str] = None,
+                 use_selenium: bool = True,
+                 request_delay: Tuple[float, float] = (1.0, 3.0),
+                 save_debug_html: bool = True,
+                 result_cache_size: int = 1024,
+                 proxy_pool: Optional[ProxyPool] = None,
+                 conditional_cache_size: int = 256,
+                 conditional_cache_bytes: int = 16 * 1024 * 1024,
+                 session_pool: Optional[SessionPool] = None):
+        # origin_override sends every fetch to a stand-in origin (e.g. fixture_server.py),
+        # keeping the real host as the first path segment
+        self.origin_override = origin_override.rstrip('/') if origin_override else None
+        self.request_delay = request_delay
+        self.save_debug_html = save_debug_html
+        self.proxy_pool = proxy_pool
+        # Cookie-warmed sessions shared by the HTTP tier and the WebDriver
+        self.session_pool = session_pool
+        # Last successful (result, page fingerprint) per profile, reused when the page
+        # is unchanged and served when a deadline expires
+        self._last_results = BoundedCache(result_cache_size)
+        # ETag / Last-Modified validators and body per URL, for conditional requests.
+        # Bodies are hundreds of KB, so the cache is bounded by total body size too.
+        self._validators = BoundedCache(conditional_cache_size, max_bytes=conditional_cache_bytes,
+                                        sizeof=lambda entry: len(entry[2]))
+        self.selenium_profiles = dict(DEFAULT_SELENIUM_PROFILES)
+        if selenium_profiles:
+            self.selenium_profiles.update({k.upper(): v for k, v in selenium_profiles.items()})
         self.session = requests.Session()
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
@@ -53,24 +325,68 @@ class SocialMediaScraper:
         
         # Initialize Selenium if available
         self.driver = None
-        if SELENIUM_AVAILABLE:
-            try:
-                self._setup_selenium()
-            except Exception as e:
-                print(f"Warning: Selenium setup failed: {e}")
-                # Don't modify the global variable
-                pass
+        self._selenium_enabled = SELENIUM_AVAILABLE and use_selenium
+        self._selenium_proxy = None
+        self._selenium_retry_at = 0.0
+        self._selenium_lock = threading.Lock()
+        if self._selenium_enabled:
+            # Start on the proxy the pool will rank first, so the first render needs no restart
+            self._restart_selenium(self.proxy_pool.proxies[0].url if self.proxy_pool else None)
+        if self.session_pool and self._selenium_enabled and not self.session_pool.harvester:
+            self.session_pool.harvester = self._harvest_cookies
     
-    def _setup_selenium(self):
-        """Setup Selenium WebDriver with Chrome options"""
+    @classmethod
+    def from_env(cls, **overrides) -> "SocialMediaScraper":
+        """Build a scraper from SCRAPER_* environment variables"""
+        delay = os.getenv("SCRAPER_REQUEST_DELAY")
+        options = {
+            "origin_override": os.getenv("SCRAPER_ORIGIN_OVERRIDE") or None,
+            "use_selenium": os.getenv("SCRAPER_USE_SELENIUM", "1") != "0",
+            "save_debug_html": os.getenv("SCRAPER_SAVE_DEBUG_HTML", "1") != "0",
+            "proxy_pool": ProxyPool.from_env(),
+            "session_pool": SessionPool.from_env(),
+        }
+        if delay:
+            low, _, high = delay.partition(',')
+            options["request_delay"] = (float(low), float(high or low))
+        options.update(overrides)
+        return cls(**options)
+    
+    def _get_selenium_profile(self, platform: str) -> SeleniumRenderProfile:
+        return self.selenium_profiles.get(platform.upper(), self.selenium_profiles["DEFAULT"])
+    
+    def _setup_selenium(self, proxy_url: Optional[str] = None):
+        """Setup Selenium WebDriver with lean Chrome options"""
         try:
+            profile = self.selenium_profiles["DEFAULT"]
+            # Resource types blocked for every platform can be refused by Chrome
+            # itself; the rest are blocked per page via CDP in _apply_selenium_profile
+            always_blocked = set(profile.blocked_resource_types)
+            for platform_profile in self.selenium_profiles.values():
+                always_blocked &= set(platform_profile.blocked_resource_types)
+            
             chrome_options = Options()
             chrome_options.add_argument("--headless")
             chrome_options.add_argument("--no-sandbox")
             chrome_options.add_argument("--disable-dev-shm-usage")
             chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
+            chrome_options.add_argument(f"--window-size={profile.window_size[0]},{profile.window_size[1]}")
             chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36")
+            if profile.disable_extensions:
+                chrome_options.add_argument("--disable-extensions")
+                chrome_options.add_argument("--disable-component-extensions-with-background-pages")
+            chrome_options.add_argument("--mute-audio")
+            if proxy_url:
+                # Chrome ignores credentials in --proxy-server; use IP-allowlisted proxies for Selenium
+                chrome_options.add_argument(f"--proxy-server={proxy_url}")
+            chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+            if "image" in always_blocked:
+                chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+                chrome_options.add_experimental_option("prefs", {
+                    "profile.managed_default_content_settings.images": 2,
+                })
+            # Page load strategy is a driver capability, so it comes from the DEFAULT profile
+            chrome_options.page_load_strategy = profile.page_load_strategy
             
             # Try to use webdriver-manager to get Chrome driver
             try:
@@ -80,6 +396,12 @@ class SocialMediaScraper:
                 # Fallback to system Chrome driver
                 self.driver = webdriver.Chrome(options=chrome_options)
                 
+            try:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+            except Exception as e:
+                print(f"Warning: CDP request blocking unavailable: {e}")
+                
+            self._selenium_proxy = proxy_url
             print("✅ Selenium WebDriver initialized successfully")
         except Exception as e:
             print(f"❌ Selenium setup failed: {e}")
@@ -96,14 +418,61 @@ class SocialMediaScraper:
     def _get_random_user_agent(self) -> str:
         return random.choice(self.user_agents)
     
-    def _add_delay(self):
+    def _remaining(self, deadline: Optional[float]) -> Optional[float]:
+        """Seconds left before a time.monotonic() deadline, or None without one"""
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
+    
+    def _expired(self, deadline: Optional[float]) -> bool:
+        remaining = self._remaining(deadline)
+        return remaining is not None and remaining < MIN_ATTEMPT_SECONDS
+    
+    def _budget(self, limit: float, deadline: Optional[float]) -> float:
+        """A per-step time limit, shortened to fit the remaining deadline"""
+        remaining = self._remaining(deadline)
+        return limit if remaining is None else min(limit, remaining)
+    
+    def _add_delay(self, deadline: Optional[float] = None):
         """Add respectful delay between requests"""
-        time.sleep(1 + random.random() * 2)
+        low, high = self.request_delay
+        if high > 0:
+            delay = low + random.random() * (high - low)
+            remaining = self._remaining(deadline)
+            if remaining is not None:
+                # Never let politeness delay eat the budget needed for the request itself
+                delay = min(delay, max(0.0, remaining - MIN_ATTEMPT_SECONDS))
+            time.sleep(delay)
+    
+    def _resolve_url(self, url: str) -> str:
+        """Rewrite a platform URL onto the origin override, if one is configured"""
+        if not self.origin_override:
+            return url
+        parsed = urlparse(url)
+        target = f"{self.origin_override}/{parsed.netloc}{parsed.path}"
+        if parsed.query:
+            target += f"?{parsed.query}"
+        return target
+    
+    def _unresolve_url(self, url: str) -> str:
+        """Map a URL on the origin override back to the platform URL it stands in for"""
+        if not self.origin_override or not url.startswith(self.origin_override + '/'):
+            return url
+        return "https://" + url[len(self.origin_override) + 1:]
     
-    def _make_request(self, url: str) -> Optional[str]:
-        """Make HTTP request with proper headers and error handling"""
+    def _make_request(self, url: str, deadline: Optional[float] = None) -> Optional[bytes]:
+        """Make HTTP request with proper headers and error handling
+        
+        Returns the raw response body; extractors work on bytes directly, so the
+        page is never charset-detected or decoded as a whole.
+        """
         try:
-            self._add_delay()
+            if self._expired(deadline):
+                print(f"Deadline reached, skipping {url}")
+                return None
+            self._add_delay(deadline)
+            platform = platform_from_host(urlparse(url).netloc) or "DEFAULT"
+            url = self._resolve_url(url)
             headers = {
                 'User-Agent': self._get_random_user_agent(),
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
@@ -123,37 +492,169 @@ class SocialMediaScraper:
                 'sec-ch-ua-platform': '"macOS"'
             }
             
-            response = self.session.get(url, headers=headers, timeout=30, allow_redirects=True)
+            validators = self._validators.get(url)
+            if validators:
+                etag, last_modified, _ = validators
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+            
+            # A cold session pool may harvest cookies with Selenium first, so do that
+            # before holding one of the proxy's concurrency slots
+            warm = self.session_pool.acquire(platform, deadline) if self.session_pool else None
+            http = warm.session if warm else self.session
+            
+            proxy = None
+            if self.proxy_pool:
+                proxy = self.proxy_pool.acquire(platform, timeout=self._budget(REQUEST_TIMEOUT, deadline))
+                if proxy is None:
+                    print(f"No proxy available for {url}")
+                    return None
+            
+            timeout = self._budget(REQUEST_TIMEOUT, deadline)
+            started = time.monotonic()
+            ok: Optional[bool] = False
+            try:
+                response = http.get(url, headers=headers, timeout=timeout,
+                                            allow_redirects=True, proxies=proxy.as_requests() if proxy else None)
+                ok = response.status_code not in PROXY_FAILURE_STATUSES and response.status_code < 500
+            except requests.exceptions.Timeout:
+                # A timeout cut short by the caller's deadline says nothing about the proxy
+                if timeout < REQUEST_TIMEOUT:
+                    ok = None
+                raise
+            finally:
+                if proxy:
+                    self.proxy_pool.release(proxy, ok, time.monotonic() - started)
             response.raise_for_status()
             
+            if is_login_wall(platform, self._unresolve_url(response.url)):
+                print(f"Login wall for {url}")
+                if warm:
+                    self.session_pool.invalidate(warm)
+                return None
+            
+            if response.status_code == 304 and validators:
+                print(f"Not modified: {url}")
+                return validators[2]
+            
             # Check if we got a meaningful response
-            if len(response.text) < 500:
-                print(f"Warning: Short response for {url} ({len(response.text)} chars)")
+            body = response.content
+            if len(body) < 500:
+                print(f"Warning: Short response for {url} ({len(body)} bytes)")
                 return None
+            
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self._validators.set(url, (etag, last_modified, body))
                 
-            return response.text
+            return body
             
         except Exception as e:
             print(f"Request failed for {url}: {e}")
             return None
     
-    def _scrape_with_selenium(self, url: str, platform: str) -> Optional[str]:
+    def _apply_selenium_profile(self, platform: str):
+        """Apply the platform's blocked resources and viewport before a page load"""
+        profile = self._get_selenium_profile(platform)
+        patterns = []
+        for resource_type in profile.blocked_resource_types:
+            patterns.extend(BLOCKED_URL_PATTERNS.get(resource_type, []))
+        try:
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as e:
+            print(f"Warning: Failed to set blocked URLs for {platform}: {e}")
+        try:
+            self.driver.set_window_size(*profile.window_size)
+        except Exception:
+            pass
+    
+    def _scrape_with_selenium(self, url: str, platform: str, deadline: Optional[float] = None) -> Optional[str]:
         """Scrape using Selenium for JavaScript-rendered content"""
-        if not self.driver or not SELENIUM_AVAILABLE:
+        if not self._selenium_enabled:
+            return None
+        if self._expired(deadline):
+            print(f"Deadline reached, skipping Selenium for {url}")
+            return None
+        
+        # A single WebDriver is shared by concurrent scrapes, so page loads are serialized
+        remaining = self._remaining(deadline)
+        if not self._selenium_lock.acquire(timeout=-1 if remaining is None else remaining):
+            print(f"Deadline reached waiting for Selenium, skipping {url}")
             return None
-            
+        try:
+            return self._drive_selenium(lambda: self._render_with_selenium(url, platform, deadline), deadline)
+        finally:
+            self._selenium_lock.release()
+    
+    def _drive_selenium(self, work: Callable[[], Any], deadline: Optional[float] = None) -> Any:
+        """Run work() on the WebDriver, routed through a "SELENIUM" proxy when there is a pool
+        
+        Must be called with _selenium_lock held. The proxy is scored on whether work()
+        returned a result; None means the step failed.
+        """
+        if not self.proxy_pool:
+            if not self.driver:
+                self._restart_selenium(None)
+            return work() if self.driver else None
+        
+        proxy = self.proxy_pool.acquire("SELENIUM", timeout=self._budget(SELENIUM_PAGE_LOAD_TIMEOUT, deadline))
+        if proxy is None:
+            print("No proxy available for Selenium")
+            return None
+        started = time.monotonic()
+        result = None
+        try:
+            if proxy.url != self._selenium_proxy or not self.driver:
+                self._restart_selenium(proxy.url)
+            if self.driver:
+                result = work()
+        finally:
+            # Without a WebDriver nothing went through the proxy, so leave its score alone
+            outcome = (result is not None) if self.driver else None
+            self.proxy_pool.release(proxy, outcome, time.monotonic() - started)
+        return result
+    
+    def _restart_selenium(self, proxy_url: Optional[str]):
+        """(Re)create the WebDriver, routed through proxy_url
+        
+        A failed setup leaves self.driver as None and is retried by a later render
+        once SELENIUM_RETRY_SECONDS have passed, so one bad start does not disable
+        Selenium for the rest of the process.
+        """
+        if self.driver:
+            print(f"Restarting Selenium on proxy {proxy_url}")
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+        if time.monotonic() < self._selenium_retry_at:
+            return
+        try:
+            self._setup_selenium(proxy_url)
+        except Exception as e:
+            self._selenium_retry_at = time.monotonic() + SELENIUM_RETRY_SECONDS
+            print(f"Warning: Selenium setup failed, retrying in {SELENIUM_RETRY_SECONDS}s: {e}")
+    
+    def _render_with_selenium(self, url: str, platform: str, deadline: Optional[float] = None) -> Optional[str]:
         try:
             print(f"🔍 Using Selenium to scrape {url}")
-            self.driver.get(url)
+            self._apply_selenium_profile(platform)
+            self._share_session_cookies(platform)
+            self.driver.set_page_load_timeout(self._budget(SELENIUM_PAGE_LOAD_TIMEOUT, deadline))
+            self.driver.get(self._resolve_url(url))
             
             # Wait for page to load
-            time.sleep(5)
+            time.sleep(self._budget(SELENIUM_SETTLE_SECONDS, deadline))
             
             # Try to wait for specific elements based on platform
             if platform == "INSTAGRAM":
                 try:
                     # Wait for profile content to load
-                    WebDriverWait(self.driver, 15).until(
+                    WebDriverWait(self.driver, self._budget(SELENIUM_WAIT_SECONDS, deadline)).until(
                         EC.presence_of_element_located((By.TAG_NAME, "body"))
                     )
                     # Try to find follower count elements
@@ -170,7 +671,7 @@ class SocialMediaScraper:
             elif platform == "TWITTER":
                 try:
                     # Wait for Twitter content to load
-                    WebDriverWait(self.driver, 15).until(
+                    WebDriverWait(self.driver, self._budget(SELENIUM_WAIT_SECONDS, deadline)).until(
                         EC.presence_of_element_located((By.TAG_NAME, "body"))
                     )
                     # Try to find follower count elements
@@ -188,55 +689,81 @@ class SocialMediaScraper:
             # Get the page source after JavaScript execution
             html = self.driver.page_source
             print(f"Got HTML with {len(html)} characters")
+            
+            # The visit leaves the browser with fresh cookies; hand them to the HTTP tier
+            if self.session_pool and platform in WARMUP_URLS:
+                self.session_pool.add(platform, self.driver.get_cookies())
             return html
             
         except Exception as e:
             print(f"Selenium scraping failed for {url}: {e}")
             return None
     
-    def _save_html_for_debug(self, html: str, platform: str, username: str):
+    def _share_session_cookies(self, platform: str):
+        """Load the pool's warmed cookies for platform into the WebDriver"""
+        if not self.session_pool:
+            return
+        cookies = [
+            {"name": c["name"], "value": c["value"], "domain": c.get("domain") or "",
+             "path": c.get("path") or "/", "secure": bool(c.get("secure")),
+             **({"expires": c["expiry"]} if c.get("expiry") else {})}
+            for c in self.session_pool.cookies_for(platform)
+        ]
+        if not cookies:
+            return
+        try:
+            # CDP can set cookies for any domain without first navigating to it
+            self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        except Exception as e:
+            print(f"Warning: Failed to share session cookies with Selenium: {e}")
+    
+    def _harvest_cookies(self, platform: str, deadline: Optional[float] = None) -> List[dict]:
+        """Visit the platform in the WebDriver and return the cookies it sets"""
+        url = WARMUP_URLS.get(platform)
+        if not url or not self._selenium_enabled or self._expired(deadline):
+            return []
+        remaining = self._remaining(deadline)
+        if not self._selenium_lock.acquire(timeout=-1 if remaining is None else remaining):
+            return []
+        
+        def visit() -> Optional[List[dict]]:
+            try:
+                print(f"🍪 Warming {platform} session with Selenium")
+                self._apply_selenium_profile(platform)
+                self.driver.set_page_load_timeout(self._budget(SELENIUM_PAGE_LOAD_TIMEOUT, deadline))
+                self.driver.get(self._resolve_url(url))
+                time.sleep(self._budget(SELENIUM_SETTLE_SECONDS, deadline))
+                return self.driver.get_cookies()
+            except Exception as e:
+                print(f"Cookie harvest failed for {platform}: {e}")
+                return None
+        
+        try:
+            return self._drive_selenium(visit, deadline) or []
+        finally:
+            self._selenium_lock.release()
+    
+    def _save_html_for_debug(self, html: Page, platform: str, username: str):
         """Save HTML content for debugging purposes"""
+        if not self.save_debug_html:
+            return
         try:
             filename = f"debug_{platform.lower()}_{username}_{int(time.time())}.html"
-            with open(filename, 'w', encoding='utf-8') as f:
+            if isinstance(html, str):
+                html = html.encode('utf-8')
+            with open(filename, 'wb') as f:
                 f.write(html)
             print(f"Saved debug HTML to {filename}")
         except Exception as e:
             print(f"Failed to save debug HTML: {e}")
     
-    def _extract_followers(self, html: str) -> Optional[int]:
+    def _extract_followers(self, html: Page) -> Optional[int]:
         """Extract follower count from HTML using multiple patterns"""
-        patterns = [
-            # Instagram specific patterns (modern)
-            r'"edge_followed_by"\s*:\s*{\s*"count"\s*:\s*([0-9]+)',
-            r'"edge_followed_by"\s*:\s*{\s*"count"\s*:\s*"?([0-9][0-9,\.]*)"?',
-            r'"followers"\s*:\s*"?([0-9][0-9,\.]*)"?',
-            r'"follower_count"\s*:\s*([0-9]+)',
-            r'"followers_count"\s*:\s*([0-9]+)',
-            r'"subscriberCount"\s*:\s*"?([0-9][0-9,\.]*)"?',
-            r'aria-label="([0-9][0-9,\.]*\s*[kmbtKMBT]?) followers"',
-            r'data-followers="([0-9,\.kmbtKMBT]+)"',
-            r'([0-9][0-9,\.]*\s*[kmbtKMBT]?)(?:\s+followers|\s+subscribers)',
-            r'([0-9,\.]+)\s*[KMBT]?\s*followers',
-            r'([0-9,\.]+)\s*[KMBT]?\s*subscribers',
-            # Twitter specific patterns (modern)
-            r'"followers_count"\s*:\s*([0-9]+)',
-            r'"followers_count"\s*:\s*"?([0-9][0-9,\.]*)"?',
-            r'"followers"\s*:\s*"?([0-9][0-9,\.]*)"?',
-            # Generic patterns
-            r'([0-9,\.]+)\s*[KMBT]?\s*followers',
-            r'([0-9,\.]+)\s*[KMBT]?\s*subscribers',
-            # New patterns for modern social media
-            r'([0-9,\.]+)\s*[KMBT]?\s*[Ff]ollowers?',
-            r'([0-9,\.]+)\s*[KMBT]?\s*[Ss]ubscribers?',
-            r'([0-9,\.]+)\s*[KMBT]?\s*[Mm]embers?'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, html, re.IGNORECASE)
-            if matches:
+        for pattern in _pick(FOLLOWER_PATTERNS, html):
+            match = pattern.search(html)
+            if match:
                 try:
-                    count_str = matches[0].replace(',', '').replace('.', '')
+                    count_str = _decode(match.group(1)).replace(',', '').replace('.', '')
                     if 'K' in count_str.upper():
                         return int(float(count_str.replace('K', '').replace('k', '')) * 1000)
                     elif 'M' in count_str.upper():
@@ -252,58 +779,86 @@ class SocialMediaScraper:
         
         return None
     
-    def _extract_posts(self, html: str) -> Optional[int]:
+    def _extract_posts(self, html: Page) -> Optional[int]:
         """Extract post count from HTML"""
-        patterns = [
-            # Instagram specific patterns
-            r'"edge_owner_to_timeline_media"\s*:\s*{\s*"count"\s*:\s*([0-9]+)',
-            r'"media_count"\s*:\s*([0-9]+)',
-            r'"posts_count"\s*:\s*([0-9]+)',
-            # Twitter specific patterns
-            r'"statuses_count"\s*:\s*([0-9]+)',
-            r'"tweets_count"\s*:\s*([0-9]+)',
-            # Generic patterns
-            r'([0-9,\.]+)\s*posts?',
-            r'([0-9,\.]+)\s*videos?',
-            r'([0-9,\.]+)\s*media'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, html, re.IGNORECASE)
-            if matches:
+        for pattern in _pick(POST_PATTERNS, html):
+            match = pattern.search(html)
+            if match:
                 try:
-                    return int(matches[0].replace(',', ''))
+                    return int(_decode(match.group(1)).replace(',', ''))
                 except (ValueError, TypeError):
                     continue
         
         return None
     
-    def _extract_bio(self, html: str) -> str:
+    def _extract_bio(self, html: Page) -> str:
         """Extract bio/description from HTML"""
-        patterns = [
-            # Instagram specific patterns
-            r'"biography"\s*:\s*"([^"]+)"',
-            r'"biography"\s*:\s*"?([^"]+)"?',
-            # Twitter specific patterns
-            r'"description"\s*:\s*"([^"]+)"',
-            r'"description"\s*:\s*"?([^"]+)"?',
-            # Generic patterns
-            r'<meta\s+name="description"\s+content="([^"]+)"',
-            r'<title>([^<]+)</title>',
-            r'"bio"\s*:\s*"([^"]+)"',
-            r'"about"\s*:\s*"([^"]+)"'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, html, re.IGNORECASE)
-            if matches:
-                bio = matches[0].strip()
+        for pattern in _pick(BIO_PATTERNS, html):
+            match = pattern.search(html)
+            if match:
+                bio = _decode(match.group(1)).strip()
                 if bio and len(bio) > 5:  # Filter out very short matches
                     return bio[:200]  # Limit length
         
         return ""
     
-    def scrape_instagram(self, username: str) -> SocialMediaData:
+    def _contains_any(self, html: Page, terms: Tuple[Pattern, Pattern]) -> bool:
+        """Case-insensitive search for any of a compiled set of terms, without lowercasing the page"""
+        return _pick(terms, html).search(html) is not None
+    
+    def _profile_key(self, platform: str, username: str) -> Tuple[str, str]:
+        return (platform, username.lstrip('@').lower())
+    
+    def _fingerprint(self, html: Page) -> str:
+        """Hash of the page regions holding the fields we extract (the whole page if none are found)"""
+        digest = hashlib.blake2b(digest_size=16)
+        found = False
+        for pattern in _pick(FINGERPRINT_REGIONS, html):
+            for match in pattern.finditer(html):
+                digest.update(match.group(0).encode('utf-8') if isinstance(html, str) else match.group(0))
+                found = True
+        # Private/verified flags depend on whether these terms occur anywhere on the page
+        for match in _pick(FINGERPRINT_TERMS, html).finditer(html):
+            digest.update(match.group(0).lower().encode('utf-8') if isinstance(html, str) else match.group(0).lower())
+            found = True
+        if not found:
+            digest.update(html.encode('utf-8') if isinstance(html, str) else html)
+        return digest.hexdigest()
+    
+    def _reuse_if_unchanged(self, platform: str, username: str, fingerprint: str) -> Optional[SocialMediaData]:
+        """The previous result for this profile if its page fingerprint is unchanged"""
+        cached = self._last_results.get(self._profile_key(platform, username))
+        if cached and cached[1] == fingerprint:
+            print(f"{platform} {username}: page unchanged, reusing previous result")
+            return cached[0]
+        return None
+    
+    def _remember(self, result: SocialMediaData, fingerprint: Optional[str] = None) -> SocialMediaData:
+        """Keep the latest successful result for unchanged-page reuse and deadline fallbacks"""
+        self._last_results.set(self._profile_key(result.platform, result.username), (result, fingerprint))
+        return result
+    
+    def _deadline_result(self, platform: str, username: str, profile_url: str) -> SocialMediaData:
+        """Result for an expired deadline: the last good scrape marked stale, or an error"""
+        cached = self._last_results.get(self._profile_key(platform, username))
+        if cached:
+            print(f"Deadline exceeded for {platform} {username}, serving cached result")
+            return replace(cached[0], stale=True)
+        return SocialMediaData(
+            platform=platform,
+            username=username,
+            followers=None,
+            following=None,
+            posts=None,
+            bio="",
+            profile_url=profile_url,
+            is_private=False,
+            is_verified=False,
+            profile_picture="",
+            error="Deadline exceeded before the profile could be fetched"
+        )
+    
+    def scrape_instagram(self, username: str, deadline: Optional[float] = None) -> SocialMediaData:
         """Scrape Instagram profile data"""
         try:
             # Try multiple URL formats and user agents
@@ -317,17 +872,21 @@ class SocialMediaScraper:
             html = None
             # First try basic scraping
             for url in urls:
-                html = self._make_request(url)
+                if self._expired(deadline):
+                    break
+                html = self._make_request(url, deadline)
                 if html and len(html) > 1000:  # Ensure we got meaningful content
                     break
             
             # If basic scraping failed or got insufficient data, try Selenium
-            if not html or len(html) < 1000:
+            if (not html or len(html) < 1000) and not self._expired(deadline):
                 print(f"Basic scraping failed for Instagram {username}, trying Selenium...")
-                html = self._scrape_with_selenium(f"https://www.instagram.com/{username}/", "INSTAGRAM")
+                html = self._scrape_with_selenium(f"https://www.instagram.com/{username}/", "INSTAGRAM", deadline)
             
             # If still no meaningful data, return error
             if not html or len(html) < 1000:
+                if self._expired(deadline):
+                    return self._deadline_result("INSTAGRAM", username, f"https://instagram.com/{username}")
                 print(f"Both basic scraping and Selenium failed for Instagram {username}")
                 return SocialMediaData(
                     platform="INSTAGRAM",
@@ -345,18 +904,20 @@ class SocialMediaScraper:
             
             print(f"Instagram {username}: Got HTML with {len(html)} characters")
             
+            # Reuse the previous parse if nothing we extract has changed
+            fingerprint = self._fingerprint(html)
+            unchanged = self._reuse_if_unchanged("INSTAGRAM", username, fingerprint)
+            if unchanged:
+                return unchanged
+            
             # Save HTML for debugging
             self._save_html_for_debug(html, "INSTAGRAM", username)
             
             # Check if profile is private
-            is_private = any(term in html.lower() for term in [
-                'private', 'this account is private', 'content is private'
-            ])
+            is_private = self._contains_any(html, INSTAGRAM_PRIVATE_TERMS)
             
             # Check if verified
-            is_verified = any(term in html.lower() for term in [
-                'verified', '✓', 'checkmark', 'blue badge'
-            ])
+            is_verified = self._contains_any(html, INSTAGRAM_VERIFIED_TERMS)
             
             followers = self._extract_followers(html)
             posts = self._extract_posts(html)
@@ -380,7 +941,7 @@ class SocialMediaScraper:
                     error="Profile data extraction failed. Instagram's modern structure makes automated data collection difficult."
                 )
             
-            return SocialMediaData(
+            return self._remember(SocialMediaData(
                 platform="INSTAGRAM",
                 username=username,
                 followers=followers,
@@ -391,7 +952,7 @@ class SocialMediaScraper:
                 is_private=is_private,
                 is_verified=is_verified,
                 profile_picture=""
-            )
+            ), fingerprint)
             
         except Exception as e:
             return SocialMediaData(
@@ -408,7 +969,7 @@ class SocialMediaScraper:
                 error=f"Scraping error: {str(e)}"
             )
     
-    def scrape_twitter(self, username: str) -> SocialMediaData:
+    def scrape_twitter(self, username: str, deadline: Optional[float] = None) -> SocialMediaData:
         """Scrape Twitter/X profile data"""
         try:
             # Try multiple URL formats
@@ -422,17 +983,21 @@ class SocialMediaScraper:
             html = None
             # First try basic scraping
             for url in urls:
-                html = self._make_request(url)
+                if self._expired(deadline):
+                    break
+                html = self._make_request(url, deadline)
                 if html and len(html) > 1000:  # Ensure we got meaningful content
                     break
             
             # If basic scraping failed or got insufficient data, try Selenium
-            if not html or len(html) < 1000:
+            if (not html or len(html) < 1000) and not self._expired(deadline):
                 print(f"Basic scraping failed for Twitter {username}, trying Selenium...")
-                html = self._scrape_with_selenium(f"https://twitter.com/{username}", "TWITTER")
+                html = self._scrape_with_selenium(f"https://twitter.com/{username}", "TWITTER", deadline)
             
             # If still no meaningful data, return error
             if not html or len(html) < 1000:
+                if self._expired(deadline):
+                    return self._deadline_result("TWITTER", username, f"https://twitter.com/{username}")
                 print(f"Both basic scraping and Selenium failed for Twitter {username}")
                 return SocialMediaData(
                     platform="TWITTER",
@@ -450,18 +1015,20 @@ class SocialMediaScraper:
             
             print(f"Twitter {username}: Got HTML with {len(html)} characters")
             
+            # Reuse the previous parse if nothing we extract has changed
+            fingerprint = self._fingerprint(html)
+            unchanged = self._reuse_if_unchanged("TWITTER", username, fingerprint)
+            if unchanged:
+                return unchanged
+            
             # Save HTML for debugging
             self._save_html_for_debug(html, "TWITTER", username)
             
             # Check if profile is private/protected
-            is_private = any(term in html.lower() for term in [
-                'protected', 'this account is protected', 'tweets are protected'
-            ])
+            is_private = self._contains_any(html, TWITTER_PRIVATE_TERMS)
             
             # Check if verified
-            is_verified = any(term in html.lower() for term in [
-                'verified', '✓', 'checkmark', 'blue badge', 'blue checkmark'
-            ])
+            is_verified = self._contains_any(html, TWITTER_VERIFIED_TERMS)
             
             followers = self._extract_followers(html)
             posts = self._extract_posts(html)
@@ -485,7 +1052,7 @@ class SocialMediaScraper:
                     error="Profile data extraction failed. Twitter/X's modern structure makes automated data collection difficult."
                 )
             
-            return SocialMediaData(
+            return self._remember(SocialMediaData(
                 platform="TWITTER",
                 username=username,
                 followers=followers,
@@ -496,7 +1063,7 @@ class SocialMediaScraper:
                 is_private=is_private,
                 is_verified=is_verified,
                 profile_picture=""
-            )
+            ), fingerprint)
             
         except Exception as e:
             return SocialMediaData(
@@ -513,7 +1080,7 @@ class SocialMediaScraper:
                 error=f"Scraping error: {str(e)}"
             )
     
-    def scrape_youtube(self, handle_or_id: str) -> SocialMediaData:
+    def scrape_youtube(self, handle_or_id: str, deadline: Optional[float] = None) -> SocialMediaData:
         """Scrape YouTube channel data"""
         try:
             if handle_or_id.startswith('@'):
@@ -529,11 +1096,15 @@ class SocialMediaScraper:
             
             html = None
             for url in urls:
-                html = self._make_request(url)
+                if self._expired(deadline):
+                    break
+                html = self._make_request(url, deadline)
                 if html:
                     break
             
             if not html:
+                if self._expired(deadline):
+                    return self._deadline_result("YOUTUBE", handle_or_id, f"https://youtube.com/@{handle_or_id}")
                 return SocialMediaData(
                     platform="YOUTUBE",
                     username=handle_or_id,
@@ -548,11 +1119,16 @@ class SocialMediaScraper:
                     error="Failed to fetch profile"
                 )
             
+            fingerprint = self._fingerprint(html)
+            unchanged = self._reuse_if_unchanged("YOUTUBE", handle_or_id, fingerprint)
+            if unchanged:
+                return unchanged
+            
             followers = self._extract_followers(html)
             posts = self._extract_posts(html)
             bio = self._extract_bio(html)
             
-            return SocialMediaData(
+            return self._remember(SocialMediaData(
                 platform="YOUTUBE",
                 username=handle_or_id,
                 followers=followers,
@@ -561,9 +1137,9 @@ class SocialMediaScraper:
                 bio=bio,
                 profile_url=f"https://youtube.com/@{handle_or_id}",
                 is_private=False,
-                is_verified="verified" in html.lower(),
+                is_verified=self._contains_any(html, GENERIC_VERIFIED_TERMS),
                 profile_picture=""
-            )
+            ), fingerprint)
             
         except Exception as e:
             return SocialMediaData(
@@ -580,13 +1156,15 @@ class SocialMediaScraper:
                 error=str(e)
             )
     
-    def scrape_linkedin(self, username: str) -> SocialMediaData:
+    def scrape_linkedin(self, username: str, deadline: Optional[float] = None) -> SocialMediaData:
         """Scrape LinkedIn profile data"""
         try:
             url = f"https://www.linkedin.com/in/{username}/"
-            html = self._make_request(url)
+            html = self._make_request(url, deadline)
             
             if not html:
+                if self._expired(deadline):
+                    return self._deadline_result("LINKEDIN", username, url)
                 return SocialMediaData(
                     platform="LINKEDIN",
                     username=username,
@@ -601,10 +1179,15 @@ class SocialMediaScraper:
                     error="Failed to fetch profile"
                 )
             
+            fingerprint = self._fingerprint(html)
+            unchanged = self._reuse_if_unchanged("LINKEDIN", username, fingerprint)
+            if unchanged:
+                return unchanged
+            
             followers = self._extract_followers(html)
             bio = self._extract_bio(html)
             
-            return SocialMediaData(
+            return self._remember(SocialMediaData(
                 platform="LINKEDIN",
                 username=username,
                 followers=followers,
@@ -615,7 +1198,7 @@ class SocialMediaScraper:
                 is_private=False,
                 is_verified=False,
                 profile_picture=""
-            )
+            ), fingerprint)
             
         except Exception as e:
             return SocialMediaData(
@@ -632,25 +1215,29 @@ class SocialMediaScraper:
                 error=str(e)
             )
     
-    def scrape_from_url(self, url: str) -> SocialMediaData:
-        """Automatically detect platform and scrape data from URL"""
+    def scrape_from_url(self, url: str, deadline: Optional[float] = None) -> SocialMediaData:
+        """Automatically detect platform and scrape data from URL
+        
+        deadline is an absolute time.monotonic() value bounding the whole scrape,
+        including every URL variant and the Selenium fallback.
+        """
         try:
             parsed = urlparse(url)
-            domain = parsed.netloc.lower()
+            platform = platform_from_host(parsed.netloc)
             path = parsed.path.strip('/')
             
-            if 'instagram.com' in domain:
+            if platform == "INSTAGRAM":
                 username = path.split('/')[0] if path else ""
-                return self.scrape_instagram(username)
-            elif 'twitter.com' in domain or 'x.com' in domain:
+                return self.scrape_instagram(username, deadline)
+            elif platform == "TWITTER":
                 username = path.split('/')[0] if path else ""
-                return self.scrape_twitter(username)
-            elif 'youtube.com' in domain:
+                return self.scrape_twitter(username, deadline)
+            elif platform == "YOUTUBE":
                 username = path.split('/')[1] if len(path.split('/')) > 1 else path
-                return self.scrape_youtube(username)
-            elif 'linkedin.com' in domain:
+                return self.scrape_youtube(username, deadline)
+            elif platform == "LINKEDIN":
                 username = path.split('/')[1] if len(path.split('/')) > 1 else path
-                return self.scrape_linkedin(username)
+                return self.scrape_linkedin(username, deadline)
             else:
                 return SocialMediaData(
                     platform="UNKNOWN",
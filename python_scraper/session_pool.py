@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Warm session pool
+Keeps per-platform requests sessions primed with cookies harvested from a real
+browser visit, persisted to disk and rotated across requests, so fewer fetches
+hit login walls and fall back to Selenium
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+# Pages visited to harvest cookies for each platform
+WARMUP_URLS = {
+    "INSTAGRAM": "https://www.instagram.com/",
+    "TWITTER": "https://x.com/",
+}
+
+# Login pages a cookieless client gets redirected to, matched as whole leading path segments
+LOGIN_WALL_PATHS = {
+    "INSTAGRAM": ("/accounts/login",),
+    "TWITTER": ("/i/flow/login", "/login"),
+}
+
+@dataclass(eq=False)
+class WarmSession:
+    platform: str
+    cookies: List[dict]
+    harvested_at: float
+    expires_at: float
+    uses: int = 0
+    session: requests.Session = field(default=None, repr=False)
+    
+    def __post_init__(self):
+        if self.session is None:
+            self.session = requests.Session()
+            for cookie in self.cookies:
+                self.session.cookies.set(
+                    cookie["name"], cookie["value"],
+                    domain=cookie.get("domain", ""), path=cookie.get("path", "/"),
+                    secure=cookie.get("secure", False), expires=cookie.get("expiry"),
+                )
+    
+    def current_cookies(self) -> List[dict]:
+        """Cookies as they are now, including any the platform has set or refreshed since harvest"""
+        return [
+            {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path,
+             "secure": c.secure, "expiry": c.expires}
+            for c in self.session.cookies
+        ]
+    
+    def to_dict(self) -> dict:
+        return {
+            "cookies": self.current_cookies(),
+            "harvested_at": self.harvested_at,
+            "expires_at": self.expires_at,
+        }
+
+def is_login_wall(platform: str, final_url: str) -> bool:
+    """True if a response was redirected to the platform's login page
+    
+    Only the URL path is checked, segment by segment, so profiles such as
+    x.com/loginradius are not mistaken for the login page.
+    """
+    path = urlparse(final_url).path.rstrip('/')
+    return any(path == login or path.startswith(login + '/') for login in LOGIN_WALL_PATHS.get(platform, ()))
+
+class SessionPool:
+    """Rotating, disk-persisted pool of cookie-warmed sessions per platform
+    
+    Sessions expire at the earliest cookie expiry or max_age after harvest, and are
+    dropped as soon as one of them hits a login wall. When a platform has no usable
+    session, harvester(platform, deadline) is asked for fresh cookies, at most once
+    per harvest_interval.
+    """
+    
+    def __init__(self, store_path: Optional[str] = None, size: int = 3, max_age: float = 6 * 3600,
+                 harvest_interval: float = 300.0,
+                 harvester: Optional[Callable[[str, Optional[float]], List[dict]]] = None):
+        self.store_path = store_path
+        self.size = size
+        self.max_age = max_age
+        self.harvest_interval = harvest_interval
+        self.harvester = harvester
+        self.sessions: Dict[str, List[WarmSession]] = {}
+        self._next: Dict[str, int] = {}
+        self._last_harvest: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        self._uses_since_save = 0
+        self.load()
+    
+    @classmethod
+    def from_env(cls) -> Optional["SessionPool"]:
+        """Build a pool if SCRAPER_SESSION_STORE is set, otherwise None"""
+        path = os.getenv("SCRAPER_SESSION_STORE")
+        if not path:
+            return None
+        return cls(
+            store_path=path,
+            size=int(os.getenv("SCRAPER_SESSIONS_PER_PLATFORM", "3")),
+            max_age=float(os.getenv("SCRAPER_SESSION_MAX_AGE", str(6 * 3600))),
+        )
+    
+    def load(self):
+        if not self.store_path or not os.path.exists(self.store_path):
+            return
+        try:
+            with open(self.store_path, encoding='utf-8') as f:
+                stored = json.load(f)
+        except Exception as e:
+            print(f"Warning: Failed to load session store {self.store_path}: {e}")
+            return
+        now = time.time()
+        with self._lock:
+            for platform, entries in stored.items():
+                self.sessions[platform] = [
+                    WarmSession(platform=platform, **entry) for entry in entries if entry["expires_at"] > now
+                ]
+    
+    def save(self):
+        """Write all live sessions to the store atomically
+        
+        The store holds live auth cookies, so it is only readable by its owner.
+        """
+        if not self.store_path:
+            return
+        with self._lock:
+            data = {platform: [s.to_dict() for s in sessions] for platform, sessions in self.sessions.items()}
+            self._uses_since_save = 0
+        tmp_path = None
+        try:
+            # mkstemp gives each save its own 0600 file, so concurrent saves never share one
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.store_path)),
+                                            prefix=os.path.basename(self.store_path), suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.store_path)
+        except Exception as e:
+            print(f"Warning: Failed to save session store {self.store_path}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def add(self, platform: str, cookies: List[dict]) -> Optional[WarmSession]:
+        """Add a session built from harvested cookies, replacing the oldest if full"""
+        if not cookies:
+            return None
+        now = time.time()
+        expiries = [c["expiry"] for c in cookies if c.get("expiry")]
+        expires_at = min([now + self.max_age] + expiries)
+        if expires_at <= now:
+            return None
+        session = WarmSession(platform=platform, cookies=cookies, harvested_at=now, expires_at=expires_at)
+        with self._lock:
+            sessions = self.sessions.setdefault(platform, [])
+            sessions.append(session)
+            while len(sessions) > self.size:
+                sessions.pop(0)
+        self.save()
+        return session
+    
+    def acquire(self, platform: str, deadline: Optional[float] = None) -> Optional[WarmSession]:
+        """Next live session for platform in rotation, harvesting one if there are none"""
+        if platform not in WARMUP_URLS:
+            return None
+        with self._lock:
+            now = time.time()
+            sessions = [s for s in self.sessions.get(platform, []) if s.expires_at > now]
+            self.sessions[platform] = sessions
+            if sessions:
+                index = self._next.get(platform, 0) % len(sessions)
+                self._next[platform] = index + 1
+                session = sessions[index]
+                session.uses += 1
+                self._uses_since_save += 1
+                save = self._uses_since_save >= 50
+            else:
+                session = None
+                save = False
+                harvest = self.harvester and now - self._last_harvest.get(platform, 0) >= self.harvest_interval
+                if harvest:
+                    self._last_harvest[platform] = now
+        if session:
+            if save:
+                # Persist cookies the platform has refreshed along the way
+                self.save()
+            return session
+        if harvest:
+            return self.add(platform, self.harvester(platform, deadline))
+        return None
+    
+    def invalidate(self, session: WarmSession):
+        """Drop a session that hit a login wall"""
+        with self._lock:
+            sessions = self.sessions.get(session.platform, [])
+            if session in sessions:
+                sessions.remove(session)
+                print(f"Dropping {session.platform} session after login wall ({len(sessions)} left)")
+        self.save()
+    
+    def cookies_for(self, platform: str) -> List[dict]:
+        """Cookies of the freshest live session, for sharing with the WebDriver"""
+        with self._lock:
+            now = time.time()
+            live = [s for s in self.sessions.get(platform, []) if s.expires_at > now]
+            return live[-1].current_cookies() if live else []
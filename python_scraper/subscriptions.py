@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Profile update subscriptions
+Clients subscribe to platform/username keys and receive only the fields that changed
+"""
+
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Set
+
+from scraper import PROFILE_URL_TEMPLATES, SocialMediaData
+
+# Fields compared between snapshots; a delta contains only those that changed
+TRACKED_FIELDS = ("followers", "following", "posts", "bio", "is_private", "is_verified", "profile_picture")
+
+def profile_key(platform: str, username: str) -> str:
+    """Normalized subscription key, e.g. INSTAGRAM:instagram"""
+    return f"{platform.upper()}:{username.strip().lstrip('@').lower()}"
+
+def profile_url(key: str) -> str:
+    """Canonical profile URL for a subscription key"""
+    platform, _, username = key.partition(':')
+    return PROFILE_URL_TEMPLATES[platform].format(username=username)
+
+def parse_keys(raw: str) -> List[str]:
+    """Parse a comma-separated list of platform:username keys"""
+    keys = []
+    for item in raw.split(','):
+        platform, sep, username = item.strip().partition(':')
+        if not sep or not username or platform.upper() not in PROFILE_URL_TEMPLATES:
+            raise ValueError(f"Invalid subscription key: {item.strip()!r} (expected platform:username)")
+        keys.append(profile_key(platform, username))
+    return keys
+
+class Subscriber:
+    def __init__(self, keys: Iterable[str], max_pending: int = 100):
+        self.keys: Set[str] = set(keys)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.closed = False
+
+class ProfileUpdateHub:
+    """Keeps the last snapshot per profile and fans out deltas to subscribers"""
+    
+    def __init__(self, failure_ttl: float = 300.0):
+        self.snapshots: Dict[str, dict] = {}
+        self.subscribers: Dict[str, Set[Subscriber]] = {}
+        # Keys whose last scrape failed, by time.monotonic() of the failure; they are
+        # not scraped again on subscribe until failure_ttl has passed
+        self.failure_ttl = failure_ttl
+        self._failed: Dict[str, float] = {}
+    
+    def subscribe(self, keys: Iterable[str]) -> Subscriber:
+        subscriber = Subscriber(keys)
+        for key in subscriber.keys:
+            self.subscribers.setdefault(key, set()).add(subscriber)
+        return subscriber
+    
+    def unsubscribe(self, subscriber: Subscriber):
+        subscriber.closed = True
+        for key in subscriber.keys:
+            listeners = self.subscribers.get(key)
+            if listeners:
+                listeners.discard(subscriber)
+                if not listeners:
+                    del self.subscribers[key]
+    
+    @property
+    def subscribed_keys(self) -> List[str]:
+        return list(self.subscribers)
+    
+    def unknown_keys(self, keys: Iterable[str]) -> List[str]:
+        """Keys with no snapshot yet, which need a scrape before a subscriber sees anything
+        
+        Keys that failed to scrape within failure_ttl are left out.
+        """
+        now = time.monotonic()
+        return [key for key in keys if key not in self.snapshots
+                and now - self._failed.get(key, float("-inf")) >= self.failure_ttl]
+    
+    def publish(self, result: SocialMediaData):
+        """Record a scrape result and push the changed fields to subscribers of its key"""
+        if not result.username:
+            return
+        key = profile_key(result.platform, result.username)
+        if result.error:
+            self._record_failure(key)
+            return
+        self._failed.pop(key, None)
+        current = {name: getattr(result, name) for name in TRACKED_FIELDS}
+        previous = self.snapshots.get(key)
+        self.snapshots[key] = current
+        
+        changes = {name: value for name, value in current.items()
+                   if previous is None or previous.get(name) != value}
+        if not changes:
+            return
+        
+        event = {"key": key, "changes": changes, "updated_at": time.time()}
+        for subscriber in list(self.subscribers.get(key, ())):
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A dropped delta would leave the client out of sync, so disconnect
+                # it instead; it gets a fresh snapshot when it resubscribes
+                self.unsubscribe(subscriber)
+    
+    def _record_failure(self, key: str):
+        now = time.monotonic()
+        self._failed[key] = now
+        if len(self._failed) > 1024:
+            self._failed = {k: t for k, t in self._failed.items() if now - t < self.failure_ttl}
+    
+    async def stream(self, subscriber: Subscriber, keepalive: float = 15.0) -> AsyncIterator[str]:
+        """Server-sent events: one snapshot of known profiles, then deltas"""
+        try:
+            snapshot = {key: self.snapshots[key] for key in subscriber.keys if key in self.snapshots}
+            yield f"event: snapshot\ndata: {json.dumps(snapshot)}\n\n"
+            while not subscriber.closed:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: update\ndata: {json.dumps(event)}\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+    
+    async def run_refresher(self, submit: Callable[[str], None], interval: float):
+        """Periodically re-scrape subscribed profiles so clients never need to poll"""
+        while True:
+            await asyncio.sleep(interval)
+            for key in self.subscribed_keys:
+                try:
+                    submit(profile_url(key))
+                except Exception as e:
+                    # Queue full: skip this round rather than pile up refreshes
+                    print(f"Skipping refresh of {key}: {e}")
+                    break
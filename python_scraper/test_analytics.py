@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized growth analytics
+Run with: python3 -m pytest test_analytics.py
+"""
+
+import math
+
+import pytest
+
+from analytics import SECONDS_PER_DAY, compute_growth_analytics, to_columns
+
+def _analyze(profiles, **options):
+    return {row["key"]: row for row in compute_growth_analytics(*to_columns(profiles), **options)}
+
+def _daily(key, followers, posts=None):
+    return {"key": key, "snapshots": [
+        {"timestamp": day * SECONDS_PER_DAY, "followers": count, "posts": None if posts is None else posts[day]}
+        for day, count in enumerate(followers)
+    ]}
+
+STEADY = [1000 + day for day in range(9)]
+
+def test_jump_after_steady_growth_is_flagged():
+    result = _analyze([_daily("A", STEADY + [100000])])["A"]
+    assert [a["followers"] for a in result["anomalies"]] == [100000.0]
+    assert result["anomalies"][0]["z_score"] > 3
+
+def test_steady_growth_is_not_flagged():
+    assert _analyze([_daily("A", STEADY)])["A"]["anomalies"] == []
+
+def test_single_follower_on_flat_history_is_not_flagged():
+    assert _analyze([_daily("A", [1000] * 10 + [1001])])["A"]["anomalies"] == []
+    result = _analyze([_daily("A", [1000] * 10 + [1100])])["A"]
+    assert [a["followers"] for a in result["anomalies"]] == [1100.0]
+
+def test_outlier_is_flagged_in_a_short_history():
+    # Three steps: with the step itself in the baseline |z| could never exceed sqrt(2)
+    result = _analyze([_daily("A", [1000, 1010, 1020, 5000])])["A"]
+    assert [a["timestamp"] for a in result["anomalies"]] == [3 * SECONDS_PER_DAY]
+
+def test_two_steps_are_not_scored():
+    assert _analyze([_daily("A", [1000, 1010, 50000])])["A"]["anomalies"] == []
+
+def test_growth_and_moving_average():
+    result = _analyze([_daily("A", [100, 110, 121], posts=[10, 12, 14])], window=2, include_series=True)["A"]
+    assert result["follower_change"] == 21
+    assert result["follower_growth_pct"] == pytest.approx(21.0)
+    assert result["daily_growth_pct"] == pytest.approx(10.0)
+    assert result["posts_per_day"] == pytest.approx(2.0)
+    assert result["series"]["moving_average"] == pytest.approx([100, 105, 115.5])
+
+def test_unsorted_snapshots_match_sorted():
+    ordered = _daily("A", STEADY + [100000])
+    shuffled = {"key": "A", "snapshots": ordered["snapshots"][::-1][3:] + ordered["snapshots"][::-1][:3]}
+    assert _analyze([shuffled], include_series=True) == _analyze([ordered], include_series=True)
+
+def test_missing_counts_are_skipped():
+    profile = _daily("A", [100, None, 120, 130])
+    result = _analyze([profile], window=2, include_series=True)["A"]
+    assert result["latest_followers"] == 130
+    assert result["follower_change"] == 30
+    assert result["series"]["followers"][1] is None
+    assert result["series"]["moving_average"] == pytest.approx([100, 100, 120, 125])
+    assert result["anomalies"] == []
+
+def test_empty_and_countless_profiles():
+    results = _analyze([{"key": "EMPTY", "snapshots": []}, _daily("NONE", [None, None]), _daily("A", [1, 2])])
+    for key in ("EMPTY", "NONE"):
+        row = results[key]
+        assert row["latest_followers"] is None and row["moving_average"] is None
+        assert row["anomalies"] == []
+    assert results["A"]["latest_followers"] == 2
+
+def test_no_profiles():
+    assert compute_growth_analytics(*to_columns([])) == []
+
+def test_results_are_json_safe():
+    row = _analyze([_daily("A", [0, 10, 20])])["A"]
+    assert row["follower_growth_pct"] is None
+    assert all(value is None or math.isfinite(value) for value in row.values() if isinstance(value, float))
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the extraction paths and page fingerprints
+Run with: python3 -m pytest test_extraction.py
+"""
+
+import re
+import sys
+
+import pytest
+
+from scraper import (INSTAGRAM_PRIVATE_TERMS, INSTAGRAM_VERIFIED_TERMS, BoundedCache,
+                     SocialMediaScraper, TWITTER_PRIVATE_TERMS)
+
+# Every code point that str \s matches, which bytes \s does not all cover
+UNICODE_SPACES = [chr(c) for c in range(sys.maxunicode + 1) if re.match(r'\s', chr(c))]
+
+PAGES = [
+    "1,234\xa0followers",
+    "12 K followers",
+    "5\xa0posts",
+    "Fixture Profile — 3 012 Followers · 41 posts",
+    '<meta name="description" content="Café ☕ and 日本語, 1.2M Followers">',
+    '{"edge_followed_by":　{"count": 987},"biography":"Über ✨ alles","is_verified":true}',
+    '{"followers_count": 42, "statuses_count": 7, "description": "Protected · tweets"}',
+    "<title>مرحبا – profile</title> 7　subscribers",
+]
+
+@pytest.fixture(scope="module")
+def scraper():
+    return SocialMediaScraper(use_selenium=False, save_debug_html=False)
+
+def _extract(scraper, page):
+    return (
+        scraper._extract_followers(page),
+        scraper._extract_posts(page),
+        scraper._extract_bio(page),
+        scraper._contains_any(page, INSTAGRAM_PRIVATE_TERMS),
+        scraper._contains_any(page, INSTAGRAM_VERIFIED_TERMS),
+        scraper._contains_any(page, TWITTER_PRIVATE_TERMS),
+        scraper._fingerprint(page),
+    )
+
+@pytest.mark.parametrize("page", PAGES)
+def test_bytes_and_str_extract_the_same(scraper, page):
+    assert _extract(scraper, page.encode('utf-8')) == _extract(scraper, page)
+
+def test_non_breaking_spaces_are_extracted(scraper):
+    assert scraper._extract_followers("1,234\xa0followers".encode('utf-8')) == 1234
+    assert scraper._extract_followers("12 K followers".encode('utf-8')) == 12000
+    assert scraper._extract_posts("5\xa0posts".encode('utf-8')) == 5
+
+@pytest.mark.parametrize("space", UNICODE_SPACES, ids=lambda c: f"U+{ord(c):04X}")
+def test_every_unicode_space_matches_in_bytes(scraper, space):
+    page = f'1,234{space}followers and 56{space}posts'
+    assert scraper._extract_followers(page.encode('utf-8')) == scraper._extract_followers(page) == 1234
+    assert scraper._extract_posts(page.encode('utf-8')) == scraper._extract_posts(page) == 56
+
+def test_json_keys_only_allow_json_whitespace(scraper):
+    assert scraper._extract_posts('"edge_owner_to_timeline_media":\t{"count": 56}') == 56
+    page = '"edge_owner_to_timeline_media":\xa0{"count":\xa056}'
+    assert scraper._extract_posts(page.encode('utf-8')) == scraper._extract_posts(page) is None
+
+BASE_PAGE = (
+    '<html><head><title>Fixture (@fixture)</title><script nonce="{nonce}"></script></head><body>'
+    '<span aria-label="1,200 followers"></span><div data-followers="1.2K"></div>'
+    '<p>845 posts</p><p>{{"followers": 1200, "bio": "Coffee and code"}}</p></body></html>'
+)
+
+@pytest.mark.parametrize("old, new", [
+    ("<title>Fixture (@fixture)</title>", "<title>Renamed (@fixture)</title>"),
+    ('aria-label="1,200 followers"', 'aria-label="1,300 followers"'),
+    ('data-followers="1.2K"', 'data-followers="1.3K"'),
+    ("845 posts", "846 posts"),
+    ('"followers": 1200', '"followers": 1300'),
+    ('"bio": "Coffee and code"', '"bio": "Tea and code"'),
+    ("<p>845 posts</p>", "<p>845 posts</p><p>This account is private</p>"),
+    ("<p>845 posts</p>", "<p>845 posts</p><p>Verified</p>"),
+])
+def test_fingerprint_changes_with_extracted_inputs(scraper, old, new):
+    page = BASE_PAGE.format(nonce="a1")
+    assert old in page
+    changed = page.replace(old, new)
+    for convert in (str, lambda p: p.encode('utf-8')):
+        assert scraper._fingerprint(convert(changed)) != scraper._fingerprint(convert(page))
+
+def test_fingerprint_covers_whole_long_bio(scraper):
+    page = '<title>Fixture</title>{"biography": "' + "x" * 600 + '%s"}'
+    for convert in (str, lambda p: p.encode('utf-8')):
+        assert scraper._fingerprint(convert(page % "a")) != scraper._fingerprint(convert(page % "b"))
+
+def test_fingerprint_ignores_volatile_markup(scraper):
+    assert scraper._fingerprint(BASE_PAGE.format(nonce="a1")) == scraper._fingerprint(BASE_PAGE.format(nonce="b2"))
+
+def test_bounded_cache_evicts_by_bytes():
+    cache = BoundedCache(10, max_bytes=100, sizeof=len)
+    cache.set("a", b"x" * 60)
+    cache.set("b", b"x" * 30)
+    cache.set("c", b"x" * 30)
+    assert cache.get("a") is None and cache.get("b") and cache.get("c")
+    assert cache.bytes == 60
+    cache.set("d", b"x" * 101)
+    assert cache.get("d") is None and cache.bytes == 60
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for job callback URL checks
+Run with: python3 -m pytest test_jobs.py
+"""
+
+import pytest
+import requests
+
+from fixture_server import FixtureServer
+from jobs import PublicOnlyAdapter, check_callback_url
+
+@pytest.fixture
+def local_server():
+    server = FixtureServer().start()
+    yield server
+    server.stop()
+
+@pytest.mark.parametrize("url", [
+    "ftp://example.com/hook",
+    "http://127.0.0.1:8000/hook",
+    "http://localhost/hook",
+    "http://169.254.169.254/latest/meta-data",
+    "http://[::1]/hook",
+])
+def test_internal_callbacks_are_rejected(url):
+    with pytest.raises(ValueError):
+        check_callback_url(url)
+
+def test_allowlist_skips_resolution_but_limits_hosts():
+    check_callback_url("http://hooks.internal/done", {"hooks.internal"})
+    with pytest.raises(ValueError):
+        check_callback_url("http://other.example/done", {"hooks.internal"})
+
+def test_unresolved_check_only_validates_the_url():
+    check_callback_url("http://127.0.0.1/hook", resolve=False)
+    with pytest.raises(ValueError):
+        check_callback_url("file:///etc/passwd", resolve=False)
+
+def test_public_only_transport_refuses_loopback_peer(local_server):
+    session = requests.Session()
+    session.trust_env = False
+    session.mount("http://", PublicOnlyAdapter())
+    with pytest.raises(requests.ConnectionError, match="non-public"):
+        session.get(local_server.url + "/www.instagram.com/fixture.profile/", timeout=5)
+    # The same request succeeds over a plain transport
+    assert requests.get(local_server.url + "/www.instagram.com/fixture.profile/", timeout=5).ok
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for proxy health scoring, ejection and probation, using local stand-in proxies
+Run with: python3 -m pytest test_proxy_pool.py
+"""
+
+import time
+
+import pytest
+
+from fixture_server import FixtureBehavior, FixtureServer
+from proxy_pool import ProxyPool
+from scraper import SocialMediaScraper
+
+@pytest.fixture
+def stand_in_proxies():
+    """Two fixture servers acting as HTTP proxies: one healthy, one failing every request"""
+    good = FixtureServer().start()
+    bad = FixtureServer(behavior=FixtureBehavior(error_rate=1.0)).start()
+    yield good, bad
+    good.stop()
+    bad.stop()
+
+def _fail_until_ejected(pool, proxy):
+    for _ in range(10):
+        assert pool.acquire("TEST", timeout=1) is proxy
+        pool.release(proxy, False)
+        if proxy.ejected_until:
+            return
+    pytest.fail("proxy was never ejected")
+
+def test_failures_eject_and_probation_failure_ejects_again():
+    pool = ProxyPool(["http://proxy-a"], cooldown=0.05)
+    proxy = pool.proxies[0]
+    _fail_until_ejected(pool, proxy)
+    assert proxy.ejections == 1
+    assert pool.acquire("TEST", timeout=0) is None
+    
+    time.sleep(0.06)
+    assert pool.acquire("TEST", timeout=1) is proxy
+    assert proxy.score == pool.eject_below
+    pool.release(proxy, False)
+    assert proxy.ejections == 2
+    assert proxy.ejected_until > time.monotonic()
+
+def test_probation_successes_restore_proxy():
+    pool = ProxyPool(["http://proxy-a"], cooldown=0.05)
+    proxy = pool.proxies[0]
+    _fail_until_ejected(pool, proxy)
+    time.sleep(0.06)
+    for _ in range(2):
+        assert pool.acquire("TEST", timeout=1) is proxy
+        pool.release(proxy, True)
+    assert pool.acquire("TEST", timeout=1) is proxy
+    pool.release(proxy, False)
+    assert proxy.ejected_until < time.monotonic()
+
+def test_concurrency_budget_and_unused_release():
+    pool = ProxyPool(["http://proxy-a"], max_concurrency=1)
+    proxy = pool.acquire("TEST", timeout=0)
+    assert pool.acquire("TEST", timeout=0.05) is None
+    pool.release(proxy, None)
+    assert proxy.requests == 0 and proxy.score == 1.0
+    assert pool.acquire("TEST", timeout=0) is proxy
+
+def test_scraper_routes_around_failing_proxy(stand_in_proxies):
+    good, bad = stand_in_proxies
+    pool = ProxyPool([bad.url, good.url], cooldown=60)
+    scraper = SocialMediaScraper(origin_override="http://origin.invalid", use_selenium=False,
+                                 request_delay=(0.0, 0.0), save_debug_html=False, proxy_pool=pool)
+    results = [scraper.scrape_instagram("fixture.profile") for _ in range(3)]
+    
+    bad_proxy, good_proxy = pool.proxies
+    assert bad_proxy.ejected_until > time.monotonic()
+    assert good_proxy.score > pool.eject_below
+    assert bad.stats["500"] > 0 and good.stats["200"] > 0
+    assert results[-1].error is None and results[-1].followers == 1234567
+
+def test_deadline_shortened_timeout_does_not_count_against_proxy():
+    slow = FixtureServer(behavior=FixtureBehavior(latency_ms=3000)).start()
+    try:
+        pool = ProxyPool([slow.url])
+        scraper = SocialMediaScraper(origin_override="http://origin.invalid", use_selenium=False,
+                                     request_delay=(0.0, 0.0), save_debug_html=False, proxy_pool=pool)
+        assert scraper._make_request("https://www.instagram.com/fixture.profile/", time.monotonic() + 1.2) is None
+        proxy = pool.proxies[0]
+        assert proxy.requests == 0 and proxy.score == 1.0
+    finally:
+        slow.stop()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for login-wall detection, the persisted session store and cookie harvesting
+Run with: python3 -m pytest test_session_pool.py
+"""
+
+import json
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+import scraper as scraper_module
+from proxy_pool import ProxyPool
+from scraper import SocialMediaScraper
+from session_pool import SessionPool, is_login_wall
+
+@pytest.mark.parametrize("platform, url, expected", [
+    ("TWITTER", "https://x.com/i/flow/login?redirect_after_login=%2Fjack", True),
+    ("TWITTER", "https://twitter.com/login", True),
+    ("TWITTER", "https://twitter.com/login/", True),
+    ("TWITTER", "https://x.com/loginradius", False),
+    ("TWITTER", "https://mobile.twitter.com/login_guru", False),
+    ("TWITTER", "https://x.com/jack?next=/login", False),
+    ("INSTAGRAM", "https://www.instagram.com/accounts/login/?next=/fixture/", True),
+    ("INSTAGRAM", "https://www.instagram.com/accounts.login.fan/", False),
+    ("YOUTUBE", "https://www.youtube.com/login", False),
+])
+def test_is_login_wall(platform, url, expected):
+    assert is_login_wall(platform, url) is expected
+
+def _cookies(name):
+    return [{"name": name, "value": "v", "domain": ".x.com", "path": "/", "expiry": time.time() + 3600}]
+
+def test_store_is_private_and_survives_reload(tmp_path):
+    store = str(tmp_path / "sessions.json")
+    pool = SessionPool(store)
+    pool.add("TWITTER", _cookies("auth_token"))
+    assert stat.S_IMODE(os.stat(store).st_mode) == 0o600
+    
+    reloaded = SessionPool(store)
+    assert [c["name"] for c in reloaded.cookies_for("TWITTER")] == ["auth_token"]
+
+def test_concurrent_saves_leave_a_valid_store(tmp_path):
+    store = str(tmp_path / "sessions.json")
+    pools = [SessionPool(store) for _ in range(4)]
+    
+    def churn(pool, i):
+        for n in range(25):
+            pool.add("TWITTER", _cookies(f"c{i}_{n}"))
+    
+    threads = [threading.Thread(target=churn, args=(pool, i)) for i, pool in enumerate(pools)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with open(store, encoding='utf-8') as f:
+        assert len(json.load(f)["TWITTER"]) == 3
+    assert os.listdir(tmp_path) == ["sessions.json"]
+
+class _StandInDriver:
+    """WebDriver stand-in that loads nothing and hands out a fixed cookie"""
+    
+    def get(self, url):
+        pass
+    
+    def get_cookies(self):
+        return _cookies("auth_token")
+    
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+def test_harvest_runs_before_the_request_reserves_a_proxy(monkeypatch):
+    monkeypatch.setattr(scraper_module, "SELENIUM_SETTLE_SECONDS", 0)
+    # One slot: a harvest started while the request held the proxy could never get it
+    proxies = ProxyPool(["http://127.0.0.1:9"], max_concurrency=1)
+    scraper = SocialMediaScraper(origin_override="http://origin.invalid", use_selenium=False,
+                                 request_delay=(0.0, 0.0), save_debug_html=False, proxy_pool=proxies,
+                                 session_pool=SessionPool(harvest_interval=0))
+    scraper._selenium_enabled = True
+    scraper.driver = _StandInDriver()
+    scraper._selenium_proxy = proxies.proxies[0].url
+    scraper.session_pool.harvester = scraper._harvest_cookies
+    
+    scraper._make_request("https://twitter.com/jack", time.monotonic() + 3)
+    assert [c["name"] for c in scraper.session_pool.cookies_for("TWITTER")] == ["auth_token"]
+    # The harvest went through the proxy and was scored, as was the request itself
+    assert proxies.proxies[0].requests == 2
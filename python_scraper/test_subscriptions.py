@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Tests for profile update snapshots and subscribe-time scraping
+Run with: python3 -m pytest test_subscriptions.py
+"""
+
+from scraper import SocialMediaData
+from subscriptions import ProfileUpdateHub
+
+def _result(username, followers=None, error=None):
+    return SocialMediaData(platform="TWITTER", username=username, followers=followers, following=None,
+                           posts=None, bio="", profile_url="", is_private=False, is_verified=False,
+                           profile_picture="", error=error)
+
+def test_unknown_keys_skip_known_and_recently_failed():
+    hub = ProfileUpdateHub(failure_ttl=300)
+    hub.publish(_result("known", followers=10))
+    hub.publish(_result("broken", error="Failed to fetch profile"))
+    assert hub.unknown_keys(["TWITTER:known", "TWITTER:broken", "TWITTER:new"]) == ["TWITTER:new"]
+
+def test_failures_expire_and_success_clears_them():
+    hub = ProfileUpdateHub(failure_ttl=0)
+    hub.publish(_result("flaky", error="timeout"))
+    assert hub.unknown_keys(["TWITTER:flaky"]) == ["TWITTER:flaky"]
+    
+    hub = ProfileUpdateHub(failure_ttl=300)
+    hub.publish(_result("flaky", error="timeout"))
+    hub.publish(_result("flaky", followers=5))
+    assert "TWITTER:flaky" in hub.snapshots and hub.unknown_keys(["TWITTER:flaky"]) == []